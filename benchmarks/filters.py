@@ -0,0 +1,44 @@
+import time
+
+import sqlalchemy
+from zodchy.codex import operator
+
+from zodchy_alchemy import FilterAssembler, contracts
+
+metadata = sqlalchemy.MetaData()
+items = sqlalchemy.Table(
+    "items",
+    metadata,
+    sqlalchemy.Column("id", sqlalchemy.Integer, primary_key=True),
+    sqlalchemy.Column("name", sqlalchemy.String),
+)
+
+
+def chained_expression(leaves: int, logic: contracts.Logic) -> contracts.ClauseExpression:
+    elements: list[contracts.Clause | contracts.Logic] = []
+    for i in range(leaves):
+        elements.append(contracts.Clause(items.c.id, operator.EQ(i)))
+        if i:
+            elements.append(logic)
+    return contracts.ClauseExpression(*elements)
+
+
+def measure(leaves: int) -> tuple[float, float]:
+    expression = chained_expression(leaves, contracts.Logic.AND)
+    started = time.perf_counter()
+    clause = FilterAssembler()(expression)
+    assembled = time.perf_counter()
+    sqlalchemy.select(items.c.id).where(clause).compile()
+    compiled = time.perf_counter()
+    return assembled - started, compiled - assembled
+
+
+def main() -> None:
+    print(f"{'leaves':>8} {'assemble, ms':>14} {'compile, ms':>13} {'compile/leaf, us':>18}")
+    for leaves in (1_000, 2_000, 4_000, 8_000, 16_000):
+        assemble, compile_ = measure(leaves)
+        print(f"{leaves:>8} {assemble * 1e3:>14.1f} {compile_ * 1e3:>13.1f} {compile_ / leaves * 1e6:>18.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+import gc
+import time
+import uuid
+
+import sqlalchemy
+
+from zodchy_alchemy.serializers import row
+
+COLUMNS = 40
+
+
+def result_rows(count: int) -> tuple[list[str], list[sqlalchemy.Row]]:
+    metadata = sqlalchemy.MetaData()
+    table = sqlalchemy.Table(
+        "wide",
+        metadata,
+        sqlalchemy.Column("id", sqlalchemy.Uuid, primary_key=True),
+        *(sqlalchemy.Column(f"c{i}", sqlalchemy.Integer if i % 2 else sqlalchemy.String) for i in range(COLUMNS - 1)),
+    )
+    engine = sqlalchemy.create_engine("sqlite://")
+    metadata.create_all(engine)
+    with engine.connect() as connection:
+        connection.execute(
+            sqlalchemy.insert(table),
+            [
+                {"id": uuid.uuid4(), **{f"c{i}": i if i % 2 else str(i) for i in range(COLUMNS - 1)}}
+                for _ in range(count)
+            ],
+        )
+        result = connection.execute(sqlalchemy.select(table))
+        return list(result.keys()), result.all()
+
+
+def measure(count: int) -> tuple[float, float]:
+    keys, rows = result_rows(count)
+    gc.collect()
+    gc.disable()
+    started = time.perf_counter()
+    expected = [row.to_dict(r) for r in rows]
+    dispatched = time.perf_counter()
+    serializer = row.RowSerializer(keys)
+    actual = [serializer(r) for r in rows]
+    precompiled = time.perf_counter()
+    gc.enable()
+    assert actual == expected
+    return dispatched - started, precompiled - dispatched
+
+
+def main() -> None:
+    print(f"{'rows':>8} {'to_dict, ms':>13} {'RowSerializer, ms':>19} {'speedup':>9}")
+    for count in (10_000, 50_000):
+        dispatched, precompiled = measure(count)
+        print(f"{count:>8} {dispatched * 1e3:>13.1f} {precompiled * 1e3:>19.1f} {dispatched / precompiled:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
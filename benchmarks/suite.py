@@ -0,0 +1,209 @@
+import argparse
+import collections.abc
+import gc
+import json
+import pathlib
+import sys
+import time
+import typing
+
+import sqlalchemy
+from zodchy.codex import operator
+
+from zodchy_alchemy import (
+    FilterAssembler,
+    JoinGraph,
+    JoinsAssembler,
+    MutationAssembler,
+    QueryAssembler,
+    StatementCache,
+    contracts,
+)
+from zodchy_alchemy.serializers import row
+
+from .serializers import result_rows
+
+BASELINE = pathlib.Path(__file__).with_name("baseline.json")
+
+
+class Case(typing.NamedTuple):
+    name: str
+    assemble: collections.abc.Callable[[], typing.Any]
+    compile: collections.abc.Callable[[typing.Any], typing.Any] | None
+    phase: str = "assemble"
+
+
+def synthetic_schema(tables: int) -> sqlalchemy.MetaData:
+    metadata = sqlalchemy.MetaData()
+    previous: sqlalchemy.Table | None = None
+    for i in range(tables):
+        columns: list[sqlalchemy.Column] = [
+            sqlalchemy.Column("id", sqlalchemy.Integer, primary_key=True),
+            sqlalchemy.Column("name", sqlalchemy.String),
+            sqlalchemy.Column("value", sqlalchemy.Integer),
+        ]
+        if previous is not None:
+            columns.append(sqlalchemy.Column("parent_id", sqlalchemy.ForeignKey(previous.c.id)))
+        previous = sqlalchemy.Table(f"t{i}", metadata, *columns)
+    return metadata
+
+
+def filter_tree(table: sqlalchemy.Table, leaves: int, group: int = 10) -> contracts.ClauseExpression:
+    elements: list[contracts.Clause | contracts.Logic] = []
+    for start in range(0, leaves, group):
+        for i in range(start, min(start + group, leaves)):
+            elements.append(contracts.Clause(table.c.value, operator.EQ(i)))
+            if i > start:
+                elements.append(contracts.Logic.AND)
+        if start:
+            elements.append(contracts.Logic.OR)
+    return contracts.ClauseExpression(*elements)
+
+
+def filter_cases(table: sqlalchemy.Table, quick: bool) -> collections.abc.Iterator[Case]:
+    for leaves in (10, 100, 1_000) if quick else (10, 100, 1_000, 10_000):
+        expression = filter_tree(table, leaves)
+        yield Case(
+            f"filters/tree/{leaves}",
+            lambda expression=expression: FilterAssembler()(expression),
+            lambda clause: sqlalchemy.select(table.c.id).where(clause).compile(),
+        )
+    for size in (10, 1_000) if quick else (10, 1_000, 100_000):
+        clause = contracts.Clause(table.c.id, operator.SET(*range(size)))
+        yield Case(
+            f"filters/in/{size}",
+            lambda clause=clause: FilterAssembler()(clause),
+            lambda element: sqlalchemy.select(table.c.id).where(element).compile(),
+        )
+
+
+def join_cases(quick: bool) -> collections.abc.Iterator[Case]:
+    for tables in (5, 50) if quick else (5, 50, 300):
+        metadata = synthetic_schema(tables)
+        graph = JoinGraph(metadata)
+        root, leaf = metadata.tables["t0"], metadata.tables[f"t{tables - 1}"]
+        query = sqlalchemy.select(leaf.c.id)
+        expression = contracts.ClauseExpression(contracts.Clause(root.c.name, operator.EQ("x")))
+        yield Case(
+            f"joins/chain/{tables}",
+            lambda query=query, graph=graph, expression=expression: JoinsAssembler(query, graph)(expression),
+            lambda statement: statement.compile(),
+        )
+
+
+def query_cases(table: sqlalchemy.Table) -> collections.abc.Iterator[Case]:
+    base = sqlalchemy.select(table.c.id, table.c.name)
+    cache = StatementCache()
+    for name, assembler in (("plain", QueryAssembler(base)), ("cached", QueryAssembler(base, cache))):
+        yield Case(
+            f"queries/{name}",
+            lambda assembler=assembler: assembler(
+                contracts.Clause(table.c.name, operator.LIKE("x")),
+                contracts.Clause(table.c.value, operator.RANGE(operator.GE(1), operator.LT(10))),
+                contracts.Clause(table.c.id, operator.DESC()),
+                operator.Limit(10),
+                operator.Offset(20),
+            ),
+            lambda statement: statement.compile(),
+        )
+
+
+def mutation_cases(table: sqlalchemy.Table, quick: bool) -> collections.abc.Iterator[Case]:
+    assembler = MutationAssembler(table)
+    for rows in (100, 1_000) if quick else (100, 1_000, 10_000):
+        data = [{"id": i, "name": f"n{i}", "value": i} for i in range(rows)]
+        yield Case(
+            f"mutations/insert/{rows}",
+            lambda data=data: assembler(*data),
+            lambda statement: statement.compile(),
+        )
+    yield Case(
+        "mutations/update",
+        lambda: assembler({"name": "x"}, contracts.Clause(table.c.id, operator.SET(*range(100)))),
+        lambda statement: statement.compile(),
+    )
+
+
+def serializer_cases(quick: bool) -> collections.abc.Iterator[Case]:
+    for count in (100, 10_000) if quick else (100, 10_000, 1_000_000):
+        keys, rows = result_rows(count)
+        yield Case(f"serializers/to_dict/{count}", lambda rows=rows: [row.to_dict(r) for r in rows], None, "convert")
+        yield Case(
+            f"serializers/row_serializer/{count}",
+            lambda keys=keys, rows=rows: list(map(row.RowSerializer(keys), rows)),
+            None,
+            "convert",
+        )
+
+
+def cases(quick: bool) -> collections.abc.Iterator[Case]:
+    table = synthetic_schema(1).tables["t0"]
+    yield from filter_cases(table, quick)
+    yield from join_cases(quick)
+    yield from query_cases(table)
+    yield from mutation_cases(table, quick)
+    yield from serializer_cases(quick)
+
+
+def best_of(repeat: int, function: collections.abc.Callable[[], typing.Any]) -> tuple[float, typing.Any]:
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        gc.collect()
+        gc.disable()
+        started = time.perf_counter()
+        result = function()
+        best = min(best, time.perf_counter() - started)
+        gc.enable()
+    return best, result
+
+
+def run(quick: bool, repeat: int) -> dict[str, float]:
+    results: dict[str, float] = {}
+    for case in cases(quick):
+        assembled, statement = best_of(repeat, case.assemble)
+        results[f"{case.name}/{case.phase}"] = assembled
+        if case.compile is not None:
+            results[f"{case.name}/compile"], _ = best_of(
+                repeat, lambda case=case, statement=statement: case.compile(statement)
+            )
+    return results
+
+
+def compare(results: dict[str, float], baseline: dict[str, float], threshold: float) -> list[str]:
+    print(f"{'case':<42} {'ms':>10} {'baseline, ms':>13} {'change':>8}")
+    regressions = []
+    for name, seconds in results.items():
+        reference = baseline.get(name)
+        change = "" if not reference else f"{(seconds / reference - 1) * 100:+.0f}%"
+        print(
+            f"{name:<42} {seconds * 1e3:>10.3f} {'' if reference is None else f'{reference * 1e3:.3f}':>13} {change:>8}"
+        )
+        if reference and seconds > reference * (1 + threshold):
+            regressions.append(name)
+    return regressions
+
+
+def main(argv: collections.abc.Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Assembler and serializer benchmarks")
+    parser.add_argument("--baseline", type=pathlib.Path, default=BASELINE)
+    parser.add_argument("--save", action="store_true", help="store the results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed slowdown, 0.25 = 25%%")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--quick", action="store_true", help="skip the largest sizes")
+    args = parser.parse_args(argv)
+
+    results = run(args.quick, args.repeat)
+    baseline = json.loads(args.baseline.read_text()) if args.baseline.exists() else {}
+    regressions = compare(results, baseline, args.threshold)
+    if args.save:
+        args.baseline.write_text(json.dumps(dict(baseline, **results), indent=2, sort_keys=True) + "\n")
+        return 0
+    if regressions:
+        print(f"\n{len(regressions)} case(s) regressed by more than {args.threshold:.0%}: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
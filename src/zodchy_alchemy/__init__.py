@@ -1,10 +1,41 @@
 from .assemblers import (
     QueryAssembler,
+    CountStrategy,
+    Pagination,
     FilterAssembler,
+    SetMode,
     OrdersAssembler,
     SlicesAssembler,
+    Keyset,
     JoinsAssembler,
-    MutationAssembler
+    JoinGraph,
+    MutationAssembler,
+    BulkProgress,
+    StatementCache,
+    CacheInfo
+)
+from .executors import (
+    Executor,
+    Balancing,
+    BatchResult,
+    ExecutorInfo,
+    Loader,
+    Page,
+    PoolInfo,
+    ResultCache,
+    ResultCacheInfo
+)
+from .instrumentation import (
+    Observer,
+    Exporter,
+    Histogram,
+    HistogramCollector
+)
+from .advisor import (
+    IndexAdvisor,
+    AdvisorReport,
+    ColumnUsage,
+    IndexSuggestion
 )
 from .contracts import (
     Clause,
@@ -12,5 +43,10 @@ from .contracts import (
 )
 from . import (
     adapters,
+    advisor,
+    operators,
+    executors,
+    explain,
+    instrumentation,
     serializers
 )
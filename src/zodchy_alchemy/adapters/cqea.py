@@ -1,12 +1,19 @@
 import collections.abc
+import time
 import typing
 
 import sqlalchemy
 import zodchy
 
 from ..contracts import Clause
+from ..instrumentation import Observer
 
 TypeAliasType = typing.cast(type[typing.Any] | None, getattr(typing, "TypeAliasType", None))
+Skip = getattr(zodchy.codex.types, "Skip", getattr(zodchy.codex.types, "SkipType", None))
+Slot: typing.TypeAlias = sqlalchemy.Column | collections.abc.Callable[[typing.Any], typing.Any] | None
+Plan: typing.TypeAlias = dict[str, Slot]
+
+_UNRESOLVED = object()
 
 
 class QueryAdapter:
@@ -17,41 +24,82 @@ class QueryAdapter:
             | None
         ) = None,
         default_table: sqlalchemy.Table | None = None,
+        observer: Observer | None = None,
     ):
         self._names_map = names_map
         self._default_table = default_table
+        self._observer = observer
+        self._plans: dict[type, Plan] = {}
 
     def __call__(
         self, query: zodchy.codex.cqea.Query
     ) -> collections.abc.Iterable[Clause | zodchy.codex.operator.SliceBit]:
+        if self._observer is not None:
+            return self._observed(query, self._observer)
+        return self._adapt(query)
+
+    def _observed(
+        self, query: zodchy.codex.cqea.Query, observer: Observer
+    ) -> collections.abc.Iterable[Clause | zodchy.codex.operator.SliceBit]:
+        started = time.perf_counter()
+        elements = list(self._adapt(query))
+        observer.record("adapter.adapt.seconds", time.perf_counter() - started)
+        observer.record("adapter.elements", len(elements))
+        return elements
+
+    def _adapt(
+        self, query: zodchy.codex.cqea.Query
+    ) -> collections.abc.Iterator[Clause | zodchy.codex.operator.SliceBit]:
+        plan = self._plans.get(type(query))
+        if plan is None:
+            plan = self.compile(type(query))
         for name, value in typing.cast(collections.abc.Iterable[tuple[str, typing.Any]], query):
-            normalized_value = self._normalize_value(value)
-            if normalized_value is zodchy.codex.types.Empty:
+            if TypeAliasType is not None and isinstance(value, TypeAliasType):
+                value = self._normalize_value(value)
+            if value is zodchy.codex.types.Empty:
+                continue
+            if isinstance(value, zodchy.codex.operator.SliceBit):
+                yield value
                 continue
-            if isinstance(normalized_value, zodchy.codex.operator.SliceBit):
-                yield normalized_value
-            else:
-                if (column := self._build_column(name)) is not None:
-                    yield Clause(column, typing.cast(zodchy.codex.operator.ClauseBit, normalized_value))
+            slot = typing.cast(Slot, plan.get(name, _UNRESOLVED))
+            if slot is _UNRESOLVED:
+                slot = self._slot(name)
+                if name not in plan:
+                    plan[name] = slot
+            if slot is None:
+                continue
+            if isinstance(slot, sqlalchemy.Column):
+                yield Clause(slot, typing.cast(zodchy.codex.operator.ClauseBit, value))
+            elif (element := slot(value)) is not None:
+                yield element
+
+    def compile(self, query_type: type[zodchy.codex.cqea.Query]) -> Plan:
+        plan = self._plans.get(query_type)
+        if plan is None:
+            plan = {}
+            for name, annotation in self._fields(query_type).items():
+                plan[name] = typing.cast(Slot, _UNRESOLVED) if self._is_slice(annotation) else self._slot(name)
+            self._plans[query_type] = plan
+        return plan
 
-    def _build_column(self, field_name: str) -> sqlalchemy.Column | None:
+    def _slot(self, field_name: str) -> Slot:
         column = self._names_map.get(field_name) if self._names_map else None
-        if column is not None:
-            if isinstance(column, sqlalchemy.Column):
-                return column
-            elif column is zodchy.codex.types.Skip:
-                return None
-            elif isinstance(column, str):
-                if self._default_table is not None:
-                    return typing.cast(sqlalchemy.Column, getattr(self._default_table.c, column))
-                raise ValueError(f"Column {field_name} not found")
-            else:
-                raise ValueError(f"Column {field_name} not found")
-        else:
-            if self._default_table is not None:
-                return typing.cast(sqlalchemy.Column, getattr(self._default_table.c, field_name))
-            else:
-                raise ValueError(f"Column {field_name} not found")
+        if column is None:
+            return self._default_column(field_name, field_name)
+        if isinstance(column, sqlalchemy.Column):
+            return column
+        if column is Skip:
+            return None
+        if isinstance(column, str):
+            return self._default_column(column, field_name)
+        if callable(column):
+            return column
+        raise ValueError(f"Column {field_name} not found")
+
+    def _default_column(self, name: str, field_name: str) -> sqlalchemy.Column:
+        if self._default_table is None or name not in self._default_table.c:
+            raise ValueError(f"Column {field_name} not found")
+        return self._default_table.c[name]
 
     def _normalize_value(self, value: typing.Any) -> typing.Any:
         if TypeAliasType is not None and isinstance(value, TypeAliasType):
@@ -59,3 +107,25 @@ class QueryAdapter:
             if alias_value is not None:
                 return alias_value
         return value
+
+    @staticmethod
+    def _fields(query_type: type) -> dict[str, typing.Any]:
+        try:
+            hints = typing.get_type_hints(query_type)
+        except Exception:
+            hints = {}
+            for klass in reversed(query_type.__mro__):
+                hints.update(getattr(klass, "__annotations__", {}))
+        return {
+            name: annotation
+            for name, annotation in hints.items()
+            if not name.startswith("_") and typing.get_origin(annotation) is not typing.ClassVar
+        }
+
+    @staticmethod
+    def _is_slice(annotation: typing.Any) -> bool:
+        candidates = [annotation, *typing.get_args(annotation)]
+        return any(
+            isinstance(candidate, type) and issubclass(candidate, zodchy.codex.operator.SliceBit)
+            for candidate in candidates
+        )
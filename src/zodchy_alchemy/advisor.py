@@ -0,0 +1,163 @@
+import collections
+import collections.abc
+import typing
+
+import sqlalchemy
+import zodchy
+
+from .assemblers.filters import like_pattern
+from .contracts import Clause, ClauseExpression, Logic
+from .operators import like_mode
+
+_EQUALITY = (zodchy.codex.operator.EQ, zodchy.codex.operator.IS, zodchy.codex.operator.SET)
+_RANGE = (
+    zodchy.codex.operator.LT,
+    zodchy.codex.operator.LE,
+    zodchy.codex.operator.GT,
+    zodchy.codex.operator.GE,
+    zodchy.codex.operator.RANGE,
+)
+
+Signature: typing.TypeAlias = tuple[
+    sqlalchemy.Table,
+    frozenset[sqlalchemy.Column],
+    tuple[sqlalchemy.Column, ...],
+    sqlalchemy.Column | None,
+]
+
+
+class ColumnUsage(typing.NamedTuple):
+    table: str
+    column: str
+    operation: str
+    hits: int
+
+
+class IndexSuggestion(typing.NamedTuple):
+    table: str
+    columns: tuple[str, ...]
+    hits: int
+
+    def to_index(self, table: sqlalchemy.Table) -> sqlalchemy.Index:
+        return sqlalchemy.Index(f"ix_{table.name}_{'_'.join(self.columns)}", *(table.c[name] for name in self.columns))
+
+
+class AdvisorReport(typing.NamedTuple):
+    unindexed: list[ColumnUsage]
+    unanchored: list[ColumnUsage]
+    composites: list[IndexSuggestion]
+
+
+class IndexAdvisor:
+    def __init__(self) -> None:
+        self._usage: collections.Counter[tuple[sqlalchemy.Column, str]] = collections.Counter()
+        self._unanchored: collections.Counter[tuple[sqlalchemy.Column, str]] = collections.Counter()
+        self._signatures: collections.Counter[Signature] = collections.Counter()
+
+    def record(
+        self,
+        filters: collections.abc.Iterable[Clause | ClauseExpression],
+        orders: collections.abc.Iterable[Clause] = (),
+    ) -> None:
+        equalities: dict[sqlalchemy.Table, set[sqlalchemy.Column]] = collections.defaultdict(set)
+        ranges: dict[sqlalchemy.Table, sqlalchemy.Column] = {}
+        for element in filters:
+            clauses = list(element) if isinstance(element, ClauseExpression) else [element]
+            conjunctive = Logic.OR not in clauses
+            for clause in clauses:
+                if not isinstance(clause, Clause) or (column := _column(clause)) is None:
+                    continue
+                operation = clause.operation
+                name = _name(operation)
+                if _unanchored(operation):
+                    self._unanchored[column, name] += 1
+                else:
+                    self._usage[column, name] += 1
+                if not conjunctive:
+                    continue
+                if isinstance(operation, _EQUALITY):
+                    equalities[column.table].add(column)
+                elif isinstance(operation, _RANGE):
+                    ranges.setdefault(column.table, column)
+        sort: list[sqlalchemy.Column] = []
+        for clause in orders:
+            if (column := _column(clause)) is not None:
+                self._usage[column, _name(clause.operation)] += 1
+                sort.append(column)
+            else:
+                sort.clear()
+                break
+        sort_table = sort[0].table if sort and all(column.table is sort[0].table for column in sort) else None
+        for table in {*equalities, *ranges, *([sort_table] if sort_table is not None else [])}:
+            equal = frozenset(equalities.get(table, ()))
+            ordered = tuple(column for column in sort if column not in equal) if table is sort_table else ()
+            self._signatures[table, equal, ordered, ranges.get(table)] += 1
+
+    def report(self, min_count: int = 1) -> AdvisorReport:
+        unindexed = [
+            ColumnUsage(column.table.name, column.name, operation, count)
+            for (column, operation), count in self._usage.most_common()
+            if count >= min_count and not _leads_index(column)
+        ]
+        unanchored = [
+            ColumnUsage(column.table.name, column.name, operation, count)
+            for (column, operation), count in self._unanchored.most_common()
+            if count >= min_count
+        ]
+        composites = []
+        for (table, equalities, sort, range_column), count in self._signatures.most_common():
+            columns = (*sorted(equalities, key=lambda column: column.name), *sort)
+            if range_column is not None and all(range_column is not column for column in columns):
+                columns = (*columns, range_column)
+            if count < min_count or len(columns) < 2 or _covered(table, len(equalities), columns):
+                continue
+            composites.append(IndexSuggestion(table.name, tuple(column.name for column in columns), count))
+        return AdvisorReport(unindexed, unanchored, composites)
+
+    def clear(self) -> None:
+        self._usage.clear()
+        self._unanchored.clear()
+        self._signatures.clear()
+
+
+def _column(clause: Clause) -> sqlalchemy.Column | None:
+    return clause.column if isinstance(getattr(clause.column, "table", None), sqlalchemy.Table) else None
+
+
+def _name(operation: typing.Any) -> str:
+    if isinstance(operation, zodchy.codex.operator.NOT):
+        return f"NOT {_name(operation.value)}"
+    return type(operation).__name__
+
+
+def _unanchored(operation: typing.Any) -> bool:
+    if isinstance(operation, zodchy.codex.operator.NOT):
+        operation = operation.value
+    return isinstance(operation, zodchy.codex.operator.LIKE) and like_pattern(
+        operation.value, like_mode(operation)
+    ).startswith("%")
+
+
+def _indexes(table: sqlalchemy.Table) -> collections.abc.Iterator[tuple[sqlalchemy.Column, ...]]:
+    if table.primary_key.columns:
+        yield tuple(table.primary_key.columns)
+    for constraint in table.constraints:
+        if isinstance(constraint, sqlalchemy.UniqueConstraint):
+            yield tuple(constraint.columns)
+    for index in table.indexes:
+        yield tuple(index.columns)
+
+
+def _leads_index(column: sqlalchemy.Column) -> bool:
+    return any(columns and columns[0] is column for columns in _indexes(column.table))
+
+
+def _covered(table: sqlalchemy.Table, equalities: int, columns: tuple[sqlalchemy.Column, ...]) -> bool:
+    for indexed in _indexes(table):
+        if (
+            len(indexed) >= len(columns)
+            and set(indexed[:equalities]) == set(columns[:equalities])
+            and all(a is b for a, b in zip(indexed[equalities : len(columns)], columns[equalities:], strict=True))
+        ):
+            return True
+    return False
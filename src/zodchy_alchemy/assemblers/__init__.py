@@ -1,6 +1,7 @@
-from .joins import JoinsAssembler
-from .queries import QueryAssembler
-from .filters import FilterAssembler
+from .joins import JoinsAssembler, JoinGraph
+from .queries import QueryAssembler, CountStrategy, Pagination
+from .filters import FilterAssembler, SetMode
 from .orders import OrdersAssembler
-from .slices import SlicesAssembler
-from .mutations import MutationAssembler
\ No newline at end of file
+from .slices import SlicesAssembler, Keyset
+from .mutations import MutationAssembler, BulkProgress
+from .templates import StatementCache, CacheInfo
@@ -0,0 +1,192 @@
+import json
+import re
+import typing
+
+import sqlalchemy
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.engine import Dialect
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.compiler import SQLCompiler
+from sqlalchemy.sql.elements import BindParameter, ColumnElement
+from sqlalchemy.sql.visitors import InternalTraversal
+
+_CONFIG = re.compile(r"[A-Za-z_][\w.]*")
+
+
+class SetMembership(ColumnElement[bool]):
+    inherit_cache = True
+    _is_implicitly_boolean = True
+    _traverse_internals = [
+        ("column", InternalTraversal.dp_clauseelement),
+        ("values", InternalTraversal.dp_clauseelement),
+        ("inversion", InternalTraversal.dp_boolean),
+    ]
+    type = sqlalchemy.Boolean()
+
+    def __init__(self, column: ColumnElement[typing.Any], values: BindParameter, inversion: bool = False):
+        self.column = column
+        self.values = values
+        self.inversion = inversion
+
+
+@compiles(SetMembership)
+def _compile_set_membership(element: SetMembership, compiler: SQLCompiler, **kw: typing.Any) -> str:
+    if element.inversion:
+        return compiler.process(element.column.not_in(element.values), **kw)
+    return compiler.process(element.column.in_(element.values), **kw)
+
+
+@compiles(SetMembership, "postgresql")
+def _compile_set_membership_postgresql(element: SetMembership, compiler: SQLCompiler, **kw: typing.Any) -> str:
+    array = sqlalchemy.bindparam(element.values.key, element.values.value, type_=postgresql.ARRAY(element.column.type))
+    if element.inversion:
+        return compiler.process(element.column != sqlalchemy.all_(array), **kw)
+    return compiler.process(element.column == sqlalchemy.any_(array), **kw)
+
+
+class BulkSetMembership(SetMembership):
+    inherit_cache = True
+
+
+class _JSONList(sqlalchemy.TypeDecorator[list[typing.Any]]):
+    impl = sqlalchemy.String
+    cache_ok = True
+
+    def __init__(self, item_type: sqlalchemy.types.TypeEngine[typing.Any]):
+        super().__init__()
+        self.item_type = item_type
+
+    def process_bind_param(self, value: list[typing.Any] | None, dialect: Dialect) -> str | None:
+        if value is None:
+            return None
+        processor = self.item_type.dialect_impl(dialect).bind_processor(dialect)
+        if processor is not None:
+            value = [processor(item) for item in value]
+        return json.dumps(value)
+
+
+@compiles(BulkSetMembership)
+def _compile_bulk_set_membership(element: BulkSetMembership, compiler: SQLCompiler, **kw: typing.Any) -> str:
+    values: BindParameter[typing.Any] = sqlalchemy.bindparam(
+        element.values.key, element.values.value, expanding=True, literal_execute=True
+    )
+    if element.inversion:
+        return compiler.process(element.column.not_in(values), **kw)
+    return compiler.process(element.column.in_(values), **kw)
+
+
+@compiles(BulkSetMembership, "postgresql")
+def _compile_bulk_set_membership_postgresql(element: BulkSetMembership, compiler: SQLCompiler, **kw: typing.Any) -> str:
+    array = sqlalchemy.bindparam(element.values.key, element.values.value, type_=postgresql.ARRAY(element.column.type))
+    return _compile_semi_join(element, sqlalchemy.select(sqlalchemy.func.unnest(array)), compiler, **kw)
+
+
+@compiles(BulkSetMembership, "sqlite")
+def _compile_bulk_set_membership_sqlite(element: BulkSetMembership, compiler: SQLCompiler, **kw: typing.Any) -> str:
+    document = sqlalchemy.bindparam(element.values.key, element.values.value, type_=_JSONList(element.column.type))
+    values = sqlalchemy.func.json_each(document).table_valued("value")
+    return _compile_semi_join(element, sqlalchemy.select(values.c.value), compiler, **kw)
+
+
+def _compile_semi_join(
+    element: BulkSetMembership, values: sqlalchemy.Select, compiler: SQLCompiler, **kw: typing.Any
+) -> str:
+    if element.inversion:
+        return compiler.process(element.column.not_in(values), **kw)
+    return compiler.process(element.column.in_(values), **kw)
+
+
+class KeysetPredicate(ColumnElement[bool]):
+    inherit_cache = True
+    _is_implicitly_boolean = True
+    _traverse_internals = [
+        ("columns", InternalTraversal.dp_clauseelement_tuple),
+        ("values", InternalTraversal.dp_clauseelement_tuple),
+        ("descending", InternalTraversal.dp_plain_obj),
+    ]
+    type = sqlalchemy.Boolean()
+
+    def __init__(
+        self,
+        columns: typing.Sequence[ColumnElement[typing.Any]],
+        values: typing.Sequence[ColumnElement[typing.Any]],
+        descending: typing.Sequence[bool],
+    ):
+        self.columns = tuple(columns)
+        self.values = tuple(values)
+        self.descending = tuple(descending)
+
+    def row_values(self) -> ColumnElement[bool] | None:
+        if len(set(self.descending)) != 1:
+            return None
+        columns = sqlalchemy.tuple_(*self.columns)
+        values = sqlalchemy.tuple_(*self.values)
+        return columns < values if self.descending[0] else columns > values
+
+    def expanded(self) -> ColumnElement[bool]:
+        terms = []
+        for i, (column, value, descending) in enumerate(zip(self.columns, self.values, self.descending, strict=True)):
+            equalities = [c == v for c, v in zip(self.columns[:i], self.values[:i], strict=True)]
+            terms.append(sqlalchemy.and_(*equalities, column < value if descending else column > value))
+        return sqlalchemy.or_(*terms)
+
+
+@compiles(KeysetPredicate)
+def _compile_keyset_predicate(element: KeysetPredicate, compiler: SQLCompiler, **kw: typing.Any) -> str:
+    predicate = element.row_values()
+    return compiler.process(element.expanded() if predicate is None else predicate, **kw)
+
+
+@compiles(KeysetPredicate, "mssql")
+@compiles(KeysetPredicate, "oracle")
+def _compile_keyset_predicate_expanded(element: KeysetPredicate, compiler: SQLCompiler, **kw: typing.Any) -> str:
+    return compiler.process(element.expanded(), **kw)
+
+
+class FullTextMatch(ColumnElement[bool]):
+    inherit_cache = True
+    _is_implicitly_boolean = True
+    _traverse_internals = [
+        ("column", InternalTraversal.dp_clauseelement),
+        ("value", InternalTraversal.dp_clauseelement),
+        ("config", InternalTraversal.dp_plain_obj),
+    ]
+    type = sqlalchemy.Boolean()
+
+    def __init__(self, column: ColumnElement[typing.Any], value: BindParameter, config: str | None = None):
+        if config is not None and not _CONFIG.fullmatch(config):
+            raise ValueError(f"Expected a text search configuration name, got {config!r}")
+        self.column = column
+        self.value = value
+        self.config = config
+
+
+class _FTS5Query(sqlalchemy.TypeDecorator[str]):
+    impl = sqlalchemy.String
+    cache_ok = True
+
+    def process_bind_param(self, value: str | None, dialect: Dialect) -> str | None:
+        if value is None:
+            return None
+        return " ".join('"{}"'.format(term.replace('"', '""')) for term in value.split())
+
+
+@compiles(FullTextMatch)
+def _compile_full_text_match(element: FullTextMatch, compiler: SQLCompiler, **kw: typing.Any) -> str:
+    return compiler.process(element.column.match(element.value), **kw)
+
+
+@compiles(FullTextMatch, "postgresql")
+def _compile_full_text_match_postgresql(element: FullTextMatch, compiler: SQLCompiler, **kw: typing.Any) -> str:
+    config: tuple[ColumnElement[typing.Any], ...] = (
+        () if element.config is None else (sqlalchemy.literal_column(f"'{element.config}'::regconfig"),)
+    )
+    document = sqlalchemy.func.to_tsvector(*config, element.column)
+    query = sqlalchemy.func.plainto_tsquery(*config, element.value)
+    return compiler.process(document.bool_op("@@")(query), **kw)
+
+
+@compiles(FullTextMatch, "sqlite")
+def _compile_full_text_match_sqlite(element: FullTextMatch, compiler: SQLCompiler, **kw: typing.Any) -> str:
+    query = sqlalchemy.bindparam(element.value.key, element.value.value, type_=_FTS5Query())
+    return f"{compiler.process(element.column, **kw)} MATCH {compiler.process(query, **kw)}"
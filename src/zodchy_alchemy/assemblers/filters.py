@@ -1,3 +1,4 @@
+import enum
 import operator
 import typing
 from collections import deque
@@ -5,78 +6,165 @@ from collections.abc import Callable, Iterable
 
 import sqlalchemy
 import zodchy
-from sqlalchemy.sql.elements import ColumnElement
+from sqlalchemy.sql.elements import BindParameter, ColumnElement
 
+from .. import operators
 from ..contracts import Clause, ClauseExpression, Logic
+from ..operators import LikeMode, like_mode
+from .elements import BulkSetMembership, FullTextMatch, SetMembership
 
 ClauseElement: typing.TypeAlias = ColumnElement[typing.Any]
 OperatorType = Callable[..., typing.Any]
+OperationHandler: typing.TypeAlias = Callable[["FilterAssembler", Clause], ClauseElement | None]
+
+
+_LOGIC_OPERATORS: dict[Logic, Callable[..., ClauseElement]] = {
+    Logic.AND: typing.cast(Callable[..., ClauseElement], sqlalchemy.and_),
+    Logic.OR: typing.cast(Callable[..., ClauseElement], sqlalchemy.or_),
+}
+
+
+class SetMode(str, enum.Enum):
+    LIST = "list"
+    ARRAY = "array"
+
+
+LIKE_ESCAPE = "\\"
+
+_LIKE_TEMPLATES: dict[LikeMode, str] = {
+    LikeMode.CONTAINS: "%{}%",
+    LikeMode.PREFIX: "{}%",
+    LikeMode.SUFFIX: "%{}",
+    LikeMode.EXACT: "{}",
+}
+
+
+def like_pattern(value: typing.Any, mode: LikeMode = LikeMode.CONTAINS) -> str:
+    escaped = str(value)
+    for special in (LIKE_ESCAPE, "%", "_"):
+        escaped = escaped.replace(special, LIKE_ESCAPE + special)
+    return _LIKE_TEMPLATES[mode].format(escaped)
 
 
 class FilterAssembler:
+    _handlers: typing.ClassVar[dict[type, OperationHandler]] = {}
+    _resolved: typing.ClassVar[dict[type, OperationHandler | None]] = {}
+
+    def __init_subclass__(cls, **kwargs: typing.Any) -> None:
+        super().__init_subclass__(**kwargs)
+        cls._handlers = {}
+        cls._resolved = {}
+
+    def __init__(self, set_mode: SetMode = SetMode.LIST, set_threshold: int | None = None):
+        if set_threshold is not None and set_threshold < 1:
+            raise ValueError(f"Expected a positive set threshold, got {set_threshold}")
+        self._set_mode = SetMode(set_mode)
+        self._set_threshold = set_threshold
+
+    @property
+    def set_threshold(self) -> int | None:
+        return self._set_threshold
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, FilterAssembler):
+            return NotImplemented
+        return type(self) is type(other) and self._options() == other._options()
+
+    def __hash__(self) -> int:
+        return hash((type(self), self._options()))
+
     def __call__(self, clause: Clause | ClauseExpression) -> ClauseElement:
         return self._assemble(clause)
 
     def _assemble(self, clause: Clause | ClauseExpression) -> ClauseElement:
         expression = ClauseExpression(clause) if isinstance(clause, Clause) else clause
-        _op_map: dict[Logic, Callable[..., ClauseElement]] = {
-            Logic.AND: typing.cast(Callable[..., ClauseElement], sqlalchemy.and_),
-            Logic.OR: typing.cast(Callable[..., ClauseElement], sqlalchemy.or_),
-        }
-        operations_stack: deque[Clause | Logic] = deque(
-            [
-                element
-                for element in expression or ()
-                if element is Logic.AND
-                or element is Logic.OR
-                or zodchy.codex.operator.FilterBit in element.operation.__class__.__mro__
-            ]
-        )
-        buffer: deque[ClauseElement] = deque()
-        while operations_stack:
-            element = operations_stack.popleft()
+        buffer: list[ClauseElement | _Run] = []
+        for element in expression or ():
             if element is Logic.AND or element is Logic.OR:
-                operands: list[ClauseElement] = []
-                i = 0
-                while buffer and i < 2:
-                    operands.append(buffer.popleft())
-                    i += 1
-                if operands:
-                    buffer.appendleft(_op_map[element](*operands) if len(operands) > 1 else operands[0])
-            else:
-                buffer.appendleft(self._assemble_element(element))
+                if len(buffer) > 1:
+                    top = buffer.pop()
+                    buffer.append(self._merge(element, top, buffer.pop()))
+            elif zodchy.codex.operator.FilterBit in element.operation.__class__.__mro__:
+                buffer.append(self._assemble_element(element))
 
         if not buffer:
             raise ValueError("Failed to assemble filter expression")
 
-        return buffer.popleft()
+        return self._materialize(buffer[-1])
+
+    def _options(self) -> tuple[typing.Hashable, ...]:
+        return self._set_mode, self._set_threshold
+
+    def _merge(self, logic: Logic, top: "ClauseElement | _Run", second: "ClauseElement | _Run") -> "_Run":
+        top_run = top if isinstance(top, _Run) and top.logic is logic else None
+        second_run = second if isinstance(second, _Run) and second.logic is logic else None
+        if top_run is not None and second_run is not None:
+            if len(top_run.operands) >= len(second_run.operands):
+                top_run.operands.extend(second_run.operands)
+                return top_run
+            second_run.operands.extendleft(reversed(top_run.operands))
+            return second_run
+        if top_run is not None:
+            top_run.operands.append(self._materialize(second))
+            return top_run
+        if second_run is not None:
+            second_run.operands.appendleft(self._materialize(top))
+            return second_run
+        return _Run(logic, deque((self._materialize(top), self._materialize(second))))
+
+    @staticmethod
+    def _materialize(element: "ClauseElement | _Run") -> ClauseElement:
+        if isinstance(element, _Run):
+            return _LOGIC_OPERATORS[element.logic](*element.operands)
+        return element
 
     def _assemble_element(self, element: ClauseElement | Clause) -> ClauseElement:
         if isinstance(element, Clause):
-            operation_factory = self._operations.get(type(element.operation))
-            if operation_factory is None:
+            handler = self._resolve(type(element.operation))
+            if handler is None:
                 raise ValueError(f"Unexpected operation: {type(element.operation)!r}")
-            result = operation_factory(element)
+            result = handler(self, element)
             if result is None:
                 return typing.cast(ClauseElement, sqlalchemy.true())
             return result
         return element
 
-    @property
-    def _operations(self) -> dict[type, Callable[[Clause], ClauseElement | None]]:
-        return {
-            zodchy.codex.operator.EQ: self._simple_clause(operator.eq),
-            zodchy.codex.operator.NE: self._simple_clause(operator.ne),
-            zodchy.codex.operator.LE: self._simple_clause(operator.le),
-            zodchy.codex.operator.LT: self._simple_clause(operator.lt),
-            zodchy.codex.operator.GE: self._simple_clause(operator.ge),
-            zodchy.codex.operator.GT: self._simple_clause(operator.gt),
-            zodchy.codex.operator.IS: lambda v: typing.cast(ClauseElement, v.column.is_(v.operation.value)),
-            zodchy.codex.operator.LIKE: self._like_clause,
-            zodchy.codex.operator.NOT: self._not_clause,
-            zodchy.codex.operator.SET: self._set_clause,
-            zodchy.codex.operator.RANGE: self._range_clause,
-        }
+    @classmethod
+    def register(
+        cls, operation: type, handler: OperationHandler | None = None
+    ) -> OperationHandler | Callable[[OperationHandler], OperationHandler]:
+        def _register(value: OperationHandler) -> OperationHandler:
+            cls._handlers[operation] = value
+            cls._invalidate()
+            return value
+
+        if handler is None:
+            return _register
+        return _register(handler)
+
+    @classmethod
+    def _resolve(cls, operation: type) -> OperationHandler | None:
+        try:
+            return cls._resolved[operation]
+        except KeyError:
+            pass
+        handler = None
+        for candidate in operation.__mro__:
+            for klass in cls.__mro__:
+                handlers = vars(klass).get("_handlers")
+                if handlers is not None and candidate in handlers:
+                    handler = handlers[candidate]
+                    break
+            if handler is not None:
+                break
+        cls._resolved[operation] = handler
+        return handler
+
+    @classmethod
+    def _invalidate(cls) -> None:
+        cls._resolved.clear()
+        for subclass in cls.__subclasses__():
+            subclass._invalidate()
 
     def _not_clause(self, clause: Clause) -> ClauseElement:
         operation = clause.operation.value
@@ -92,12 +180,16 @@ class FilterAssembler:
         return sqlalchemy.not_(self._assemble(inner_clause))
 
     @staticmethod
-    def _simple_clause(op: OperatorType) -> Callable[[Clause], ClauseElement]:
-        def _wrapper(value: Clause) -> ClauseElement:
+    def _simple_clause(op: OperatorType) -> OperationHandler:
+        def _wrapper(assembler: "FilterAssembler", value: Clause) -> ClauseElement:
             return typing.cast(ClauseElement, op(value.column, value.operation.value))
 
         return _wrapper
 
+    @staticmethod
+    def _is_clause(assembler: "FilterAssembler", clause: Clause) -> ClauseElement:
+        return typing.cast(ClauseElement, clause.column.is_(clause.operation.value))
+
     def _logic_clause(self, op: OperatorType) -> Callable[[Iterable[Clause]], ClauseElement]:
         def _wrapper(clauses: Iterable[Clause]) -> ClauseElement:
             assembled = tuple(self._assemble(clause) for clause in clauses)
@@ -109,15 +201,39 @@ class FilterAssembler:
     def _like_clause(clause: Clause, inversion: bool = False) -> ClauseElement:
         column = clause.column
         operation = clause.operation
-        value = f"%{operation.value}%"
+        value = operation.value
+        if not isinstance(value, BindParameter):
+            value = like_pattern(value, like_mode(operation))
         if isinstance(operation, zodchy.codex.operator.LIKE) and operation.case_sensitive:
-            return typing.cast(ClauseElement, column.notlike(value) if inversion else column.like(value))
-        return typing.cast(ClauseElement, column.notilike(value) if inversion else column.ilike(value))
+            if inversion:
+                return typing.cast(ClauseElement, column.notlike(value, escape=LIKE_ESCAPE))
+            return typing.cast(ClauseElement, column.like(value, escape=LIKE_ESCAPE))
+        if inversion:
+            return typing.cast(ClauseElement, column.notilike(value, escape=LIKE_ESCAPE))
+        return typing.cast(ClauseElement, column.ilike(value, escape=LIKE_ESCAPE))
 
     @staticmethod
-    def _set_clause(clause: Clause, inversion: bool = False) -> ClauseElement:
+    def _search_clause(clause: Clause) -> ClauseElement:
+        value = clause.operation.value
+        if not isinstance(value, BindParameter):
+            value = sqlalchemy.bindparam(getattr(clause.column, "key", None), value, unique=True)
+        return FullTextMatch(clause.column, value, typing.cast(operators.SEARCH, clause.operation).config)
+
+    def _set_clause(self, clause: Clause, inversion: bool = False) -> ClauseElement:
         column = clause.column
-        value = list(clause.operation.value)
+        value = clause.operation.value
+        if isinstance(value, BindParameter):
+            if not value.expanding:
+                return BulkSetMembership(column, value, inversion)
+        else:
+            value = list(value)
+            if self._set_threshold is not None and len(value) > self._set_threshold:
+                bulk: BindParameter[typing.Any] = sqlalchemy.bindparam(getattr(column, "key", None), value, unique=True)
+                return BulkSetMembership(column, bulk, inversion)
+        if self._set_mode is SetMode.ARRAY:
+            if not isinstance(value, BindParameter):
+                value = sqlalchemy.bindparam(getattr(column, "key", None), value, expanding=True, unique=True)
+            return SetMembership(column, value, inversion)
         if inversion:
             return typing.cast(ClauseElement, column.notin_(value))
         return typing.cast(ClauseElement, column.in_(value))
@@ -133,3 +249,34 @@ class FilterAssembler:
         if len(params) == 1:
             return self._assemble(params[0])
         return None
+
+
+class _Run:
+    __slots__ = ("logic", "operands")
+
+    def __init__(self, logic: Logic, operands: deque[ClauseElement]):
+        self.logic = logic
+        self.operands = operands
+
+
+def _method(name: str) -> OperationHandler:
+    def _handler(assembler: FilterAssembler, clause: Clause) -> ClauseElement | None:
+        return typing.cast(ClauseElement | None, getattr(assembler, name)(clause))
+
+    return _handler
+
+
+FilterAssembler._handlers = {
+    zodchy.codex.operator.EQ: FilterAssembler._simple_clause(operator.eq),
+    zodchy.codex.operator.NE: FilterAssembler._simple_clause(operator.ne),
+    zodchy.codex.operator.LE: FilterAssembler._simple_clause(operator.le),
+    zodchy.codex.operator.LT: FilterAssembler._simple_clause(operator.lt),
+    zodchy.codex.operator.GE: FilterAssembler._simple_clause(operator.ge),
+    zodchy.codex.operator.GT: FilterAssembler._simple_clause(operator.gt),
+    zodchy.codex.operator.IS: FilterAssembler._is_clause,
+    zodchy.codex.operator.LIKE: _method("_like_clause"),
+    zodchy.codex.operator.NOT: _method("_not_clause"),
+    zodchy.codex.operator.SET: _method("_set_clause"),
+    zodchy.codex.operator.RANGE: _method("_range_clause"),
+    operators.SEARCH: _method("_search_clause"),
+}
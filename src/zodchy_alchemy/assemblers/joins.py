@@ -1,3 +1,5 @@
+import collections
+import collections.abc
 import typing
 
 import sqlalchemy
@@ -7,11 +9,65 @@ from sqlalchemy.sql.elements import BinaryExpression
 from sqlalchemy.sql.selectable import FromClause
 
 from ..contracts import Clause, ClauseExpression
+from .filters import FilterAssembler
+
+JoinStep: typing.TypeAlias = tuple[sqlalchemy.Table, BinaryExpression]
+Filter: typing.TypeAlias = Clause | ClauseExpression
+
+
+class JoinGraph:
+    def __init__(self, metadata: sqlalchemy.MetaData):
+        self._tables: dict[str, sqlalchemy.Table] = {}
+        self._edges: dict[str, dict[str, BinaryExpression]] = collections.defaultdict(dict)
+        self._paths: dict[tuple[frozenset[str], str], tuple[JoinStep, ...] | None] = {}
+        for table in metadata.sorted_tables:
+            self._tables[table.name] = table
+            for fk in sorted(table.foreign_keys, key=lambda fk: fk.parent.name):
+                referred = fk.column.table
+                if not isinstance(referred, sqlalchemy.Table) or referred is table:
+                    continue
+                condition = typing.cast(BinaryExpression, fk.column == fk.parent)
+                self._edges[table.name].setdefault(referred.name, condition)
+                self._edges[referred.name].setdefault(table.name, condition)
+
+    def path(self, sources: collections.abc.Iterable[str], target: str) -> tuple[JoinStep, ...] | None:
+        key = (frozenset(sources), target)
+        try:
+            return self._paths[key]
+        except KeyError:
+            pass
+        path = self._paths[key] = self._shortest_path(key[0], target)
+        return path
+
+    def _shortest_path(self, sources: frozenset[str], target: str) -> tuple[JoinStep, ...] | None:
+        if target in sources or target not in self._tables:
+            return None
+        previous: dict[str, str | None] = dict.fromkeys(sorted(sources))
+        queue = collections.deque(previous)
+        while queue:
+            name = queue.popleft()
+            for neighbour in self._edges.get(name, {}):
+                if neighbour in previous:
+                    continue
+                previous[neighbour] = name
+                if neighbour == target:
+                    return self._steps(previous, target)
+                queue.append(neighbour)
+        return None
+
+    def _steps(self, previous: dict[str, str | None], target: str) -> tuple[JoinStep, ...]:
+        steps: list[JoinStep] = []
+        name = target
+        while (source := previous[name]) is not None:
+            steps.append((self._tables[name], self._edges[source][name]))
+            name = source
+        return tuple(reversed(steps))
 
 
 class JoinsAssembler:
-    def __init__(self, query: sqlalchemy.Select):
+    def __init__(self, query: sqlalchemy.Select, graph: JoinGraph | None = None):
         self._query = query
+        self._graph = graph
         self._joins_digest: set[str] = set()
         self._tables: set[str] = set()
         for from_clause in query.columns_clause_froms:
@@ -26,6 +82,113 @@ class JoinsAssembler:
                 self._build_link(clause)
         return self._query
 
+    def semi_join(
+        self, filters: collections.abc.Iterable[Filter], filter_assembler: FilterAssembler
+    ) -> tuple[sqlalchemy.Select, list[Filter]]:
+        groups: dict[str, tuple[tuple[JoinStep, ...], list[Filter]]] = {}
+        remaining: list[Filter] = []
+        for element in filters:
+            target = self._semi_join_target(element)
+            if target is None:
+                remaining.append(element)
+            elif target in groups:
+                groups[target][1].append(element)
+            elif (path := self._to_many_path(self._clauses(element)[0])) is not None:
+                groups[target] = (path, [element])
+            else:
+                remaining.append(element)
+
+        for path, elements in groups.values():
+            tables = [table for table, _ in path]
+            subquery: sqlalchemy.Select[typing.Any] = (
+                sqlalchemy.select(sqlalchemy.literal_column("1"))
+                .select_from(*tables)
+                .where(*(condition for _, condition in path))
+                .where(*(filter_assembler(element) for element in elements))
+                .correlate_except(*tables)
+            )
+            self._query = self._query.where(subquery.exists())
+        return self._query, remaining
+
+    def _semi_join_target(self, element: Filter) -> str | None:
+        clauses = self._clauses(element)
+        if any(self._matches_null(clause.operation) for clause in clauses):
+            return None
+        names = {self._get_table_name(getattr(clause.column, "table", None)) for clause in clauses}
+        if len(names) != 1:
+            return None
+        name = names.pop()
+        return None if name is None or name in self._tables else name
+
+    @staticmethod
+    def _matches_null(operation: typing.Any) -> bool:
+        return isinstance(operation, (zodchy.codex.operator.IS, zodchy.codex.operator.EQ)) and operation.value is None
+
+    def _to_many_path(self, clause: Clause) -> tuple[JoinStep, ...] | None:
+        known = {name: table for table in self._query.froms if (name := self._get_table_name(table)) is not None}
+        steps: list[JoinStep] = []
+        for condition in clause.conditions:
+            if (step := self._explicit_step(condition, known)) is not None:
+                steps.append(step)
+                known[step[0].name] = step[0]
+        target = clause.column.table
+        if target.name not in known:
+            if self._graph is not None:
+                steps.extend(self._graph.path(known, target.name) or ())
+            elif (step := self._foreign_key_step(target, known)) is not None:
+                steps.append(step)
+        if not steps or steps[-1][0].name != target.name:
+            return None
+        if not any(self._is_to_many(table, condition) for table, condition in steps):
+            return None
+        return tuple(steps)
+
+    @staticmethod
+    def _explicit_step(
+        condition: BinaryExpression | Table, known: collections.abc.Mapping[str, FromClause]
+    ) -> JoinStep | None:
+        if isinstance(condition, Table):
+            for fk in condition.foreign_keys:
+                if fk.column.table.name in known:
+                    return condition, typing.cast(BinaryExpression, fk.column == fk.parent)
+            return None
+        for column in (condition.left, condition.right):
+            table = getattr(column, "table", None)
+            if isinstance(table, Table) and table.name not in known:
+                return table, condition
+        return None
+
+    @staticmethod
+    def _foreign_key_step(target: Table, known: collections.abc.Mapping[str, FromClause]) -> JoinStep | None:
+        for fk in target.foreign_keys:
+            if fk.column.table.name in known:
+                return target, typing.cast(BinaryExpression, fk.column == fk.parent)
+        for table in known.values():
+            for fk in getattr(table, "foreign_keys", ()):
+                if fk.column.table is target:
+                    return target, typing.cast(BinaryExpression, fk.column == fk.parent)
+        return None
+
+    @staticmethod
+    def is_to_one(table: typing.Any, condition: BinaryExpression) -> bool:
+        for own, other in ((condition.left, condition.right), (condition.right, condition.left)):
+            if getattr(own, "table", None) is table and isinstance(own, sqlalchemy.Column):
+                return isinstance(other, sqlalchemy.Column) and other.references(own)
+        return False
+
+    @staticmethod
+    def _is_to_many(table: Table, condition: BinaryExpression) -> bool:
+        for own, other in ((condition.left, condition.right), (condition.right, condition.left)):
+            if getattr(own, "table", None) is table and isinstance(own, sqlalchemy.Column):
+                return isinstance(other, sqlalchemy.Column) and own.references(other)
+        return False
+
+    @staticmethod
+    def _clauses(element: Filter) -> list[Clause]:
+        if isinstance(element, Clause):
+            return [element]
+        return [clause for clause in element if isinstance(clause, Clause)]
+
     def _build_link(self, clause: Clause) -> None:
         column = clause.column
         table = getattr(column, "table", None)
@@ -42,6 +205,10 @@ class JoinsAssembler:
                 if isinstance(joined_table, sqlalchemy.Table):
                     self._register_foreign_keys(joined_table)
 
+        if self._graph is not None:
+            self._follow_path(table_name)
+            return
+
         for fk_table_name, fk in self._foreign_keys.items():
             if fk_table_name == table_name:
                 fk_condition = typing.cast(BinaryExpression, fk.column == fk.parent)
@@ -51,6 +218,13 @@ class JoinsAssembler:
                         self._register_foreign_keys(joined)
                 break
 
+    def _follow_path(self, table_name: str) -> None:
+        if table_name in self._tables or self._graph is None:
+            return
+        for table, condition in self._graph.path(self._tables, table_name) or ():
+            if self._register_join(condition) is not None:
+                self._query = self._query.join(table, condition, isouter=True)
+
     def _prepare(self) -> None:
         setup_joins = getattr(self._query, "_setup_joins", None)
         if setup_joins:
@@ -59,6 +233,8 @@ class JoinsAssembler:
                 if isinstance(join_condition, BinaryExpression):
                     self._register_join(join_condition)
 
+        if self._graph is not None:
+            return
         for entity in self._query.froms:
             if isinstance(entity, sqlalchemy.Table):
                 self._register_foreign_keys(entity)
@@ -79,6 +255,8 @@ class JoinsAssembler:
         return registered_table
 
     def _register_foreign_keys(self, table: sqlalchemy.Table) -> None:
+        if self._graph is not None:
+            return
         for foreign_key in table.foreign_keys:
             table_name = self._get_table_name(foreign_key.column.table)
             if table_name is not None and table_name not in self._foreign_keys:
@@ -1,18 +1,49 @@
 import collections.abc
+import time
+import typing
 
 import sqlalchemy
 import zodchy
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncConnection
 
 from .. import contracts
 from .filters import FilterAssembler
 
+if typing.TYPE_CHECKING:
+    from ..executors.cache import ResultCache
+
 DataRow = collections.abc.Mapping
+DataRows: typing.TypeAlias = collections.abc.Iterable[DataRow] | collections.abc.AsyncIterable[DataRow]
+ProgressCallback: typing.TypeAlias = collections.abc.Callable[["BulkProgress"], None]
+ReturningCallback: typing.TypeAlias = collections.abc.Callable[[collections.abc.Sequence[sqlalchemy.Row]], None]
+ColumnRef: typing.TypeAlias = sqlalchemy.Column | str
+
+_BULK_PREFIX = "bulk_"
+_BULK_VALUES = "bulk"
+
+
+class BulkProgress(typing.NamedTuple):
+    rows: int
+    chunks: int
+    elapsed: float
+
+    @property
+    def throughput(self) -> float:
+        return self.rows / self.elapsed if self.elapsed > 0 else 0.0
 
 
 class MutationAssembler:
-    def __init__(self, table: sqlalchemy.Table):
+    def __init__(
+        self,
+        table: sqlalchemy.Table,
+        filter_assembler: FilterAssembler | None = None,
+        result_cache: "ResultCache | None" = None,
+    ):
         self._table = table
-        self._filter_assembler = FilterAssembler()
+        self._filter_assembler = filter_assembler or FilterAssembler()
+        self._result_cache = result_cache
+        self._bulk_insert: sqlalchemy.Insert | None = None
 
     def __call__(
         self, *elements: DataRow | contracts.Clause | contracts.ClauseExpression
@@ -26,6 +57,199 @@ class MutationAssembler:
             return self._delete(filters)
         return None
 
+    async def bulk_insert(
+        self,
+        connection: AsyncConnection,
+        rows: DataRows,
+        chunk_size: int = 1000,
+        on_progress: ProgressCallback | None = None,
+    ) -> BulkProgress:
+        if self._bulk_insert is None:
+            self._bulk_insert = sqlalchemy.insert(self._table)
+        statement = self._bulk_insert
+
+        async def execute(chunk: list[DataRow]) -> None:
+            await connection.execute(statement, chunk)
+
+        return await self._execute_chunks(connection, execute, rows, chunk_size, on_progress)
+
+    async def bulk_update(
+        self,
+        connection: AsyncConnection,
+        rows: DataRows,
+        key: ColumnRef,
+        *filters: contracts.Clause | contracts.ClauseExpression,
+        chunk_size: int = 1000,
+        on_progress: ProgressCallback | None = None,
+    ) -> BulkProgress:
+        key_column = self._column(key)
+        guard = self._guard(filters)
+        if connection.dialect.name != "postgresql":
+            guard = self._literal_guard(guard, connection.dialect)
+        statements: dict[tuple[str, ...], sqlalchemy.Update] = {}
+
+        async def execute(chunk: list[DataRow]) -> None:
+            names = self._names(chunk, key_column)
+            if len(names) < 2:
+                raise ValueError(f"Expected columns to update besides {key_column.name}")
+            if connection.dialect.name == "postgresql":
+                await connection.execute(self._values_update(chunk, names, key_column, guard))
+                return
+            if (statement := statements.get(names)) is None:
+                statement = statements[names] = self._keyed_update(names, key_column, guard)
+            await connection.execute(
+                statement, [{_BULK_PREFIX + name: value for name, value in row.items()} for row in chunk]
+            )
+
+        return await self._execute_chunks(connection, execute, rows, chunk_size, on_progress)
+
+    async def bulk_upsert(
+        self,
+        connection: AsyncConnection,
+        rows: DataRows,
+        conflict: collections.abc.Iterable[ColumnRef] | None = None,
+        update: collections.abc.Iterable[ColumnRef] | None = None,
+        returning: collections.abc.Iterable[sqlalchemy.Column] = (),
+        on_returning: ReturningCallback | None = None,
+        chunk_size: int = 1000,
+        on_progress: ProgressCallback | None = None,
+    ) -> BulkProgress:
+        conflict_columns = tuple(
+            self._table.primary_key.columns if conflict is None else (self._column(c) for c in conflict)
+        )
+        if not conflict_columns:
+            raise ValueError(f"Expected conflict columns for {self._table.name}")
+        update_columns = None if update is None else tuple(self._column(c) for c in update)
+        returning_columns = tuple(returning)
+        dialect = connection.dialect.name
+        statements: dict[tuple[str, ...], sqlalchemy.Insert] = {}
+
+        async def execute(chunk: list[DataRow]) -> None:
+            names = self._names(chunk, *conflict_columns)
+            if (statement := statements.get(names)) is None:
+                statement = statements[names] = self._upsert(
+                    dialect, names, conflict_columns, update_columns, returning_columns
+                )
+            result = await connection.execute(statement, chunk)
+            if returning_columns and on_returning is not None:
+                on_returning(result.all())
+
+        return await self._execute_chunks(connection, execute, rows, chunk_size, on_progress)
+
+    async def _execute_chunks(
+        self,
+        connection: AsyncConnection,
+        execute: collections.abc.Callable[[list[DataRow]], collections.abc.Awaitable[None]],
+        rows: DataRows,
+        chunk_size: int,
+        on_progress: ProgressCallback | None,
+    ) -> BulkProgress:
+        if chunk_size < 1:
+            raise ValueError(f"Expected a positive chunk size, got {chunk_size}")
+        started = time.perf_counter()
+        progress = BulkProgress(0, 0, 0.0)
+        async for chunk in _chunks(rows, chunk_size):
+            await execute(chunk)
+            if self._result_cache is not None and not progress.chunks:
+                self._result_cache.invalidate_on_commit(connection, self._table)
+            progress = BulkProgress(progress.rows + len(chunk), progress.chunks + 1, time.perf_counter() - started)
+            if on_progress is not None:
+                on_progress(progress)
+        return progress
+
+    def _upsert(
+        self,
+        dialect: str,
+        names: tuple[str, ...],
+        conflict: tuple[sqlalchemy.Column, ...],
+        update: tuple[sqlalchemy.Column, ...] | None,
+        returning: tuple[sqlalchemy.Column, ...],
+    ) -> sqlalchemy.Insert:
+        keys = {column.name for column in conflict}
+        if update is None:
+            update = tuple(self._table.c[name] for name in names if name not in keys)
+        statement: sqlalchemy.Insert
+        if dialect == "postgresql" or dialect == "sqlite":
+            insert = postgresql.insert(self._table) if dialect == "postgresql" else sqlite.insert(self._table)
+            if update:
+                statement = insert.on_conflict_do_update(
+                    index_elements=list(conflict),
+                    set_={column.name: insert.excluded[column.name] for column in update},
+                )
+            else:
+                statement = insert.on_conflict_do_nothing(index_elements=list(conflict))
+        elif dialect == "mysql" or dialect == "mariadb":
+            duplicate = mysql.insert(self._table)
+            if not update:
+                update = conflict[:1]
+            statement = duplicate.on_duplicate_key_update(
+                {column.name: duplicate.inserted[column.name] for column in update}
+            )
+        else:
+            raise ValueError(f"Upsert is not supported on {dialect}")
+        return statement.returning(*returning) if returning else statement
+
+    def _keyed_update(
+        self, names: tuple[str, ...], key: sqlalchemy.Column, guard: sqlalchemy.ColumnElement[bool] | None
+    ) -> sqlalchemy.Update:
+        statement = (
+            sqlalchemy.update(self._table)
+            .values({name: sqlalchemy.bindparam(_BULK_PREFIX + name) for name in names if name != key.name})
+            .where(key == sqlalchemy.bindparam(_BULK_PREFIX + key.name))
+        )
+        return statement if guard is None else statement.where(guard)
+
+    def _values_update(
+        self,
+        chunk: list[DataRow],
+        names: tuple[str, ...],
+        key: sqlalchemy.Column,
+        guard: sqlalchemy.ColumnElement[bool] | None,
+    ) -> sqlalchemy.Update:
+        columns = [self._table.c[name] for name in names]
+        data = [tuple(row[name] for name in names) for row in chunk]
+        data[0] = tuple(sqlalchemy.cast(value, column.type) for value, column in zip(data[0], columns, strict=True))
+        values = sqlalchemy.values(*(sqlalchemy.column(c.name, c.type) for c in columns), name=_BULK_VALUES).data(data)
+        statement = (
+            sqlalchemy.update(self._table)
+            .values({name: values.c[name] for name in names if name != key.name})
+            .where(key == values.c[key.name])
+        )
+        return statement if guard is None else statement.where(guard)
+
+    def _column(self, column: ColumnRef) -> sqlalchemy.Column:
+        return self._table.c[column if isinstance(column, str) else column.name]
+
+    @staticmethod
+    def _names(chunk: list[DataRow], *keys: sqlalchemy.Column) -> tuple[str, ...]:
+        names = tuple(chunk[0])
+        for key in keys:
+            if key.name not in names:
+                raise ValueError(f"Expected key column {key.name} in every row")
+        for row in chunk:
+            if row.keys() != chunk[0].keys():
+                raise ValueError(f"Expected rows with the same columns, got {tuple(row)} and {names}")
+        return names
+
+    def _guard(
+        self, filters: collections.abc.Sequence[contracts.Clause | contracts.ClauseExpression]
+    ) -> sqlalchemy.ColumnElement[bool] | None:
+        if not filters:
+            return None
+        return sqlalchemy.and_(*(self._filter_assembler(clause) for clause in filters))
+
+    @staticmethod
+    def _literal_guard(
+        guard: sqlalchemy.ColumnElement[bool] | None, dialect: sqlalchemy.Dialect
+    ) -> sqlalchemy.ColumnElement[bool] | None:
+        if guard is None:
+            return None
+        compiled = guard.compile(dialect=dialect)
+        if not compiled.post_compile_params and not compiled.literal_execute_params:
+            return guard
+        rendered = guard.compile(dialect=dialect, compile_kwargs={"literal_binds": True})
+        return sqlalchemy.literal_column(str(rendered), sqlalchemy.Boolean)
+
     def _update(
         self, data: list[DataRow], filters: list[contracts.Clause | contracts.ClauseExpression]
     ) -> sqlalchemy.Update:
@@ -60,3 +284,21 @@ class MutationAssembler:
                 data.append(element)
 
         return data, filters
+
+
+async def _chunks(rows: DataRows, size: int) -> collections.abc.AsyncIterator[list[DataRow]]:
+    chunk: list[DataRow] = []
+    if isinstance(rows, collections.abc.AsyncIterable):
+        async for row in rows:
+            chunk.append(row)
+            if len(chunk) == size:
+                yield chunk
+                chunk = []
+    else:
+        for row in rows:
+            chunk.append(row)
+            if len(chunk) == size:
+                yield chunk
+                chunk = []
+    if chunk:
+        yield chunk
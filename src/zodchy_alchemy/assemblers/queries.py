@@ -1,29 +1,164 @@
 import collections.abc
+import enum
+import typing
 
 import sqlalchemy
 import zodchy
+from sqlalchemy.sql import util as sql_util
+from sqlalchemy.sql.elements import BinaryExpression
 
 from ..contracts import Clause, ClauseExpression
+from ..instrumentation import Observer, stopwatch
 from .filters import FilterAssembler
-from .joins import JoinsAssembler
+from .joins import JoinGraph, JoinsAssembler
 from .orders import OrdersAssembler
 from .slices import SlicesAssembler
+from .templates import StatementCache, StatementTemplate
+
+if typing.TYPE_CHECKING:
+    from ..advisor import IndexAdvisor
+
+TOTAL_LABEL = "total_count"
+
+
+class CountStrategy(str, enum.Enum):
+    WINDOW = "window"
+    SEPARATE = "separate"
+
+
+class Pagination(typing.NamedTuple):
+    query: sqlalchemy.Select
+    count_query: sqlalchemy.Select
+    strategy: CountStrategy
 
 
 class QueryAssembler:
-    def __init__(self, query: sqlalchemy.Select):
+    def __init__(
+        self,
+        query: sqlalchemy.Select,
+        cache: StatementCache | None = None,
+        filter_assembler: FilterAssembler | None = None,
+        join_graph: JoinGraph | None = None,
+        semi_joins: bool = False,
+        observer: Observer | None = None,
+        advisor: "IndexAdvisor | None" = None,
+    ):
         self._query = query
+        self._cache = cache
+        self._filter_assembler = filter_assembler or FilterAssembler()
+        self._join_graph = join_graph
+        self._semi_joins = semi_joins
+        self._observer = observer
+        self._advisor = advisor
 
     def __call__(self, *clauses: Clause | ClauseExpression | zodchy.codex.operator.SliceBit) -> sqlalchemy.Select:
+        if self._observer is not None:
+            self._observe(clauses)
+        if self._advisor is not None:
+            filters, orders, _ = self._separate(clauses)
+            self._advisor.record(filters, orders)
+        return self._statement(clauses)
+
+    def paginate(
+        self,
+        *clauses: Clause | ClauseExpression | zodchy.codex.operator.SliceBit,
+        strategy: CountStrategy = CountStrategy.WINDOW,
+    ) -> Pagination:
+        strategy = CountStrategy(strategy)
+        query = self(*clauses)
+        if strategy is CountStrategy.WINDOW:
+            query = query.add_columns(sqlalchemy.func.count().over().label(TOTAL_LABEL))
+        filtered = self._statement(
+            tuple(clause for clause in clauses if not isinstance(clause, zodchy.codex.operator.SliceBit))
+        )
+        return Pagination(query, self._count(filtered), strategy)
+
+    def _statement(
+        self, clauses: tuple[Clause | ClauseExpression | zodchy.codex.operator.SliceBit, ...]
+    ) -> sqlalchemy.Select:
+        if (
+            self._cache is None
+            or (template := StatementTemplate.build(clauses, self._filter_assembler.set_threshold)) is None
+        ):
+            return self._assemble(clauses)
+        key = (self._query, self._filter_assembler, self._join_graph, self._semi_joins, template.shape)
+        statement = self._cache.get(key)
+        if self._observer is not None:
+            self._observer.record("query.statement_cache.hit", statement is not None)
+        if statement is None:
+            statement = self._assemble(template.elements)
+            self._cache.put(key, statement)
+        return statement.params(template.params) if template.params else statement
+
+    @staticmethod
+    def _count(query: sqlalchemy.Select) -> sqlalchemy.Select:
+        query = query.order_by(None).limit(None).offset(None)
+        joins = typing.cast(tuple[tuple[typing.Any, typing.Any, typing.Any, dict], ...], query._setup_joins)
+        if (
+            query._from_obj
+            or query._group_by_clauses
+            or query._having_criteria
+            or query._distinct
+            or any(
+                not isinstance(target, sqlalchemy.Table)
+                or not isinstance(onclause, BinaryExpression)
+                or left is not None
+                for target, onclause, left, _ in joins
+            )
+        ):
+            return sqlalchemy.select(sqlalchemy.func.count()).select_from(query.subquery())
+        referenced = (
+            set() if query.whereclause is None else set(sql_util.find_tables(query.whereclause, check_columns=True))
+        )
+        kept = []
+        for target, onclause, _, flags in reversed(joins):
+            if target in referenced or not flags["isouter"] or not JoinsAssembler.is_to_one(target, onclause):
+                kept.append((target, onclause, flags))
+                referenced.update(sql_util.find_tables(onclause, check_columns=True))
+        targets = {target for target, *_ in joins}
+        count = sqlalchemy.select(sqlalchemy.func.count()).select_from(
+            *(table for table in query.columns_clause_froms if table not in targets)
+        )
+        for target, onclause, flags in reversed(kept):
+            count = count.join(target, onclause, isouter=flags["isouter"], full=flags["full"])
+        return count if query.whereclause is None else count.where(query.whereclause)
+
+    def _assemble(
+        self, clauses: collections.abc.Iterable[Clause | ClauseExpression | zodchy.codex.operator.SliceBit]
+    ) -> sqlalchemy.Select:
+        watch = stopwatch(self._observer, "query")
+        query = self._query
         filters, orders, slices = self._separate(clauses)
-        filter_expression = self._build_expression(filters)
+        watch.lap("separate")
+        if self._semi_joins and filters:
+            query, filters = JoinsAssembler(query, self._join_graph).semi_join(filters, self._filter_assembler)
+            watch.lap("semi_join")
         if (filter_expression := self._build_expression(filters)) is not None:
-            self._query = JoinsAssembler(self._query)(filter_expression)
-        if filter_expression and (filters := FilterAssembler()(filter_expression)) is not None:
-            self._query = self._query.where(filters)
-        self._query = OrdersAssembler(self._query)(*orders)
-        self._query = SlicesAssembler(self._query)(*slices)
-        return self._query
+            joined = JoinsAssembler(query, self._join_graph)(filter_expression)
+            watch.record("joins", len(joined._setup_joins) - len(query._setup_joins))
+            watch.lap("join")
+            query = joined.where(self._filter_assembler(filter_expression))
+            watch.lap("filter")
+        query = OrdersAssembler(query)(*orders)
+        watch.lap("order")
+        query = SlicesAssembler(query)(*slices)
+        watch.lap("slice")
+        return query
+
+    def _observe(self, clauses: collections.abc.Iterable[typing.Any]) -> None:
+        observer = typing.cast(Observer, self._observer)
+        count = 0
+        for element in clauses:
+            for clause in element if isinstance(element, ClauseExpression) else (element,):
+                if not isinstance(clause, Clause):
+                    continue
+                count += 1
+                operation = clause.operation
+                if isinstance(operation, zodchy.codex.operator.NOT):
+                    operation = operation.value
+                if isinstance(operation, zodchy.codex.operator.SET):
+                    observer.record("query.set_size", len(operation.value))
+        observer.record("query.clauses", count)
 
     @staticmethod
     def _separate(
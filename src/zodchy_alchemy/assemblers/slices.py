@@ -1,5 +1,26 @@
+import base64
+import collections.abc
+import datetime
+import decimal
+import json
+import typing
+import uuid
+
 import sqlalchemy
 import zodchy
+from sqlalchemy.sql import operators
+from sqlalchemy.sql.elements import ColumnElement, UnaryExpression
+
+from .elements import KeysetPredicate
+
+Ordering: typing.TypeAlias = tuple[ColumnElement[typing.Any], bool]
+
+
+class Keyset(zodchy.codex.operator.SliceBit):
+    def __init__(self, key: ColumnElement[typing.Any], cursor: str | None = None):
+        super().__init__(0)
+        self.key = key
+        self.cursor = cursor
 
 
 class SlicesAssembler:
@@ -11,8 +32,98 @@ class SlicesAssembler:
             self._assemble(operation)
         return self._query
 
+    @classmethod
+    def next_cursor(cls, query: sqlalchemy.Select, rows: collections.abc.Sequence[sqlalchemy.Row]) -> str | None:
+        limit = query._limit
+        if not rows or (isinstance(limit, int) and len(rows) < limit):
+            return None
+        mapping = rows[-1]._mapping
+        values = []
+        for column, _ in cls._orderings(query):
+            try:
+                value = mapping[column]
+            except KeyError:
+                raise ValueError(f"Ordering column {column} is not selected") from None
+            if value is None:
+                raise ValueError(f"Expected a non-NULL value in ordering column {column}")
+            values.append(value)
+        return _encode_cursor(values)
+
     def _assemble(self, operation: zodchy.codex.operator.SliceBit) -> None:
         if isinstance(operation, zodchy.codex.operator.Limit):
             self._query = self._query.limit(operation.value)
         elif isinstance(operation, zodchy.codex.operator.Offset):
             self._query = self._query.offset(operation.value)
+        elif isinstance(operation, Keyset):
+            self._seek(operation)
+
+    def _seek(self, operation: Keyset) -> None:
+        orderings = self._orderings(self._query)
+        for column, _ in (*orderings, (operation.key, False)):
+            if getattr(column, "nullable", False):
+                raise ValueError(f"Expected non-nullable ordering columns for keyset pagination, got {column}")
+        if not any(column.compare(operation.key) for column, _ in orderings):
+            descending = orderings[-1][1] if orderings else False
+            self._query = self._query.order_by(operation.key.desc() if descending else operation.key.asc())
+            orderings.append((operation.key, descending))
+        if operation.cursor is None:
+            return
+        values = _decode_cursor(operation.cursor)
+        if len(values) != len(orderings):
+            raise ValueError("Invalid cursor")
+        self._query = self._query.where(
+            KeysetPredicate(
+                [column for column, _ in orderings],
+                [sqlalchemy.literal(value, column.type) for (column, _), value in zip(orderings, values, strict=True)],
+                [descending for _, descending in orderings],
+            )
+        )
+
+    @staticmethod
+    def _orderings(query: sqlalchemy.Select) -> list[Ordering]:
+        orderings: list[Ordering] = []
+        for clause in query._order_by_clauses:
+            if isinstance(clause, UnaryExpression):
+                if clause.modifier is operators.desc_op:
+                    orderings.append((clause.element, True))
+                    continue
+                if clause.modifier is operators.asc_op:
+                    orderings.append((clause.element, False))
+                    continue
+                raise ValueError(f"Unsupported ordering for keyset pagination: {clause}")
+            orderings.append((clause, False))
+        return orderings
+
+
+_CURSOR_TYPES: dict[str, tuple[type, collections.abc.Callable[[str], typing.Any]]] = {
+    "datetime": (datetime.datetime, datetime.datetime.fromisoformat),
+    "date": (datetime.date, datetime.date.fromisoformat),
+    "time": (datetime.time, datetime.time.fromisoformat),
+    "uuid": (uuid.UUID, uuid.UUID),
+    "decimal": (decimal.Decimal, decimal.Decimal),
+}
+
+
+def _encode_cursor(values: collections.abc.Iterable[typing.Any]) -> str:
+    payload = []
+    for value in values:
+        for tag, (kind, _) in _CURSOR_TYPES.items():
+            if isinstance(value, kind):
+                value = {"t": tag, "v": value.isoformat() if hasattr(value, "isoformat") else str(value)}
+                break
+        else:
+            if not isinstance(value, str | int | float):
+                raise ValueError(f"Expected a cursor value of a supported type, got {type(value).__name__}")
+        payload.append(value)
+    document = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(document).rstrip(b"=").decode()
+
+
+def _decode_cursor(cursor: str) -> list[typing.Any]:
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        if not isinstance(payload, list):
+            raise ValueError
+        return [_CURSOR_TYPES[value["t"]][1](value["v"]) if isinstance(value, dict) else value for value in payload]
+    except (ValueError, KeyError, TypeError):
+        raise ValueError("Invalid cursor") from None
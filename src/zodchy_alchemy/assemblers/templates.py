@@ -0,0 +1,185 @@
+import collections
+import collections.abc
+import copy
+import typing
+
+import sqlalchemy
+import zodchy
+from sqlalchemy.sql.elements import ClauseElement
+
+from .. import operators
+from ..contracts import Clause, ClauseExpression, Logic
+from .filters import like_pattern
+
+Shape: typing.TypeAlias = collections.abc.Hashable
+QueryElement: typing.TypeAlias = Clause | ClauseExpression | zodchy.codex.operator.SliceBit
+
+
+class CacheInfo(typing.NamedTuple):
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+class StatementCache:
+    def __init__(self, maxsize: int = 128):
+        if maxsize < 1:
+            raise ValueError(f"Expected a positive cache size, got {maxsize}")
+        self._maxsize = maxsize
+        self._entries: collections.OrderedDict[Shape, sqlalchemy.Select] = collections.OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Shape) -> sqlalchemy.Select | None:
+        statement = self._entries.get(key)
+        if statement is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return statement
+
+    def put(self, key: Shape, statement: sqlalchemy.Select) -> None:
+        self._entries[key] = statement
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def info(self) -> CacheInfo:
+        return CacheInfo(self.hits, self.misses, self._maxsize, len(self._entries))
+
+
+class StatementTemplate:
+    _simple_operations: typing.ClassVar[tuple[type, ...]] = (
+        zodchy.codex.operator.EQ,
+        zodchy.codex.operator.NE,
+        zodchy.codex.operator.LE,
+        zodchy.codex.operator.LT,
+        zodchy.codex.operator.GE,
+        zodchy.codex.operator.GT,
+    )
+
+    def __init__(self, elements: collections.abc.Iterable[QueryElement], set_threshold: int | None = None):
+        self._set_threshold = set_threshold
+        self.params: dict[str, typing.Any] = {}
+        self.elements: list[QueryElement] = []
+        shape: list[Shape] = []
+        for element in elements:
+            template, element_shape = self._element(element)
+            self.elements.append(template)
+            shape.append(element_shape)
+        self.shape: Shape = tuple(shape)
+
+    @classmethod
+    def build(
+        cls, elements: collections.abc.Iterable[QueryElement], set_threshold: int | None = None
+    ) -> typing.Self | None:
+        try:
+            template = cls(elements, set_threshold)
+            hash(template.shape)
+        except (TypeError, _UnsupportedElement):
+            return None
+        return template
+
+    def _element(self, element: QueryElement) -> tuple[QueryElement, Shape]:
+        if isinstance(element, Clause):
+            if isinstance(element.operation, zodchy.codex.operator.OrderBit):
+                return element, (element.column, type(element.operation), element.operation.value)
+            return self._clause(element)
+        if isinstance(element, ClauseExpression):
+            templates: list[Clause | Logic] = []
+            shape: list[Shape] = []
+            for item in element:
+                if item is Logic.AND or item is Logic.OR:
+                    templates.append(item)
+                    shape.append(item)
+                else:
+                    clause, clause_shape = self._clause(item)
+                    templates.append(clause)
+                    shape.append(clause_shape)
+            return ClauseExpression(*templates), (ClauseExpression, tuple(shape))
+        if isinstance(element, zodchy.codex.operator.Limit | zodchy.codex.operator.Offset):
+            bind = self._bind(element.value, type_=sqlalchemy.Integer())
+            return self._rebind(element, bind), (type(element),)
+        raise _UnsupportedElement(element)
+
+    def _clause(self, clause: Clause) -> tuple[Clause, Shape]:
+        operation, shape = self._operation(clause.operation)
+        conditions = tuple(self._condition(condition) for condition in clause.conditions)
+        return Clause(clause.column, operation, *clause.conditions), (clause.column, shape, conditions)
+
+    @staticmethod
+    def _condition(condition: typing.Any) -> Shape:
+        cache_key = condition._generate_cache_key() if isinstance(condition, ClauseElement) else None
+        if cache_key is None:
+            raise _UnsupportedElement(condition)
+        return cache_key.key, tuple(_freeze(bind.effective_value) for bind in cache_key.bindparams)
+
+    def _operation(self, operation: typing.Any) -> tuple[typing.Any, Shape]:
+        kind = type(operation)
+        value = operation.value
+        if kind in self._simple_operations:
+            if value is None or isinstance(value, ClauseElement):
+                return operation, (kind, value)
+            return self._rebind(operation, self._bind(value)), (kind,)
+        if kind is zodchy.codex.operator.IS:
+            return operation, (kind, value)
+        if kind is zodchy.codex.operator.LIKE or kind is operators.LIKE:
+            mode = operators.like_mode(operation)
+            return self._rebind(operation, self._bind(like_pattern(value, mode))), (
+                kind,
+                operation.case_sensitive,
+                mode,
+            )
+        if kind is operators.SEARCH:
+            return self._rebind(operation, self._bind(value)), (kind, operation.config)
+        if kind is zodchy.codex.operator.SET:
+            values = list(value)
+            bulk = self._set_threshold is not None and len(values) > self._set_threshold
+            return self._rebind(operation, self._bind(values, expanding=not bulk)), (kind, bulk)
+        if kind is zodchy.codex.operator.NOT:
+            inner, shape = self._operation(value)
+            return self._rebind(operation, inner), (kind, shape)
+        if kind is zodchy.codex.operator.RANGE:
+            bounds: list[typing.Any] = []
+            shapes: list[Shape] = []
+            for bound in value:
+                if bound is None:
+                    bounds.append(None)
+                    shapes.append(None)
+                else:
+                    bound_template, bound_shape = self._operation(bound)
+                    bounds.append(bound_template)
+                    shapes.append(bound_shape)
+            return self._rebind(operation, tuple(bounds)), (kind, tuple(shapes))
+        raise _UnsupportedElement(operation)
+
+    def _bind(self, value: typing.Any, **kwargs: typing.Any) -> sqlalchemy.BindParameter:
+        name = f"tpl_{len(self.params)}"
+        self.params[name] = value
+        return sqlalchemy.bindparam(name, **kwargs)
+
+    @staticmethod
+    def _rebind(operation: typing.Any, value: typing.Any) -> typing.Any:
+        template = copy.copy(operation)
+        template._data = value
+        return template
+
+
+class _UnsupportedElement(Exception):
+    pass
+
+
+def _freeze(value: typing.Any) -> typing.Any:
+    if isinstance(value, list | tuple):
+        return tuple(_freeze(item) for item in value)
+    return value
@@ -37,29 +37,42 @@ class Logic(str, enum.Enum):
 
 
 class Clause:
+    __slots__ = ("column", "operation", "conditions")
+
+    column: sqlalchemy.Column
+    operation: zodchy.codex.operator.ClauseBit
+    conditions: tuple[sqlalchemy.BinaryExpression | sqlalchemy.Table, ...]
+
     def __init__(
         self,
         column: sqlalchemy.Column,
         operation: zodchy.codex.operator.ClauseBit,
         *conditions: sqlalchemy.BinaryExpression | sqlalchemy.Table,
     ):
-        self.column = column
-        self.operation = operation
-        self.conditions = conditions
+        object.__setattr__(self, "column", column)
+        object.__setattr__(self, "operation", operation)
+        object.__setattr__(self, "conditions", conditions)
+
+    def __setattr__(self, name: str, value: typing.Any) -> None:
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __reduce__(self) -> tuple[type[typing.Self], tuple[typing.Any, ...]]:
+        return type(self), (self.column, self.operation, *self.conditions)
 
     def __and__(self, other: typing.Self | "ClauseExpression") -> typing.Self | "ClauseExpression":
-        self_obj = Clause(self.column, self.operation, *self.conditions)
         if isinstance(other, Clause):
-            return ClauseExpression(other, self_obj, Logic.AND)
+            return ClauseExpression._node((_checked(other), _checked(self), Logic.AND))
         elif isinstance(other, ClauseExpression):
-            return ClauseExpression(self_obj, *other, Logic.AND)
+            return ClauseExpression._node((_checked(self), other, Logic.AND))
 
     def __or__(self, other: typing.Self | "ClauseExpression") -> typing.Self | "ClauseExpression":
-        self_obj = Clause(self.column, self.operation, *self.conditions)
         if isinstance(other, Clause):
-            return ClauseExpression(other, self_obj, Logic.OR)
+            return ClauseExpression._node((_checked(other), _checked(self), Logic.OR))
         elif isinstance(other, ClauseExpression):
-            return ClauseExpression(self_obj, *other, Logic.OR)
+            return ClauseExpression._node((_checked(self), other, Logic.OR))
 
     def clone(self) -> typing.Self:
         return type(self)(self.column, self.operation, *self.conditions)
@@ -69,30 +82,76 @@ class Clause:
 
 
 class ClauseExpression:
-    def __init__(self, *clauses: Clause | Logic):
-        self._clauses = list(self._assure_filter_clause(clauses))
+    __slots__ = ("_parts", "_postfix")
 
-    def __iter__(self) -> collections.abc.Generator[Clause | Logic, None, None]:
-        yield from self._clauses
+    _parts: tuple["Clause | Logic | ClauseExpression", ...]
+    _postfix: tuple[Clause | Logic, ...] | None
+
+    def __init__(self, *clauses: Clause | Logic):
+        parts = tuple(self._assure_filter_clause(clauses))
+        self._parts = parts
+        self._postfix = parts
+
+    @classmethod
+    def _node(cls, parts: tuple["Clause | Logic | ClauseExpression", ...]) -> typing.Self:
+        node = cls.__new__(cls)
+        node._parts = parts
+        node._postfix = None
+        return node
+
+    def __iter__(self) -> collections.abc.Iterator[Clause | Logic]:
+        if self._postfix is None:
+            self._postfix = self._flatten()
+        return iter(self._postfix)
 
     def __and__(self, other: typing.Self | Clause) -> typing.Self:
         if isinstance(other, Clause):
-            return type(self)(other, *self._clauses, Logic.AND)
+            return self._node((_checked(other), self, Logic.AND))
         elif isinstance(other, ClauseExpression):
-            return type(self)(*self._clauses, *other, Logic.AND)
+            return self._node((self, other, Logic.AND))
 
     def __or__(self, other: typing.Self | Clause) -> typing.Self:
         if isinstance(other, Clause):
-            return type(self)(other, *self._clauses, Logic.OR)
+            return self._node((_checked(other), self, Logic.OR))
         elif isinstance(other, ClauseExpression):
-            return type(self)(*self._clauses, *other, Logic.OR)
+            return self._node((self, other, Logic.OR))
+
+    def _flatten(self) -> tuple[Clause | Logic, ...]:
+        postfix: list[Clause | Logic] = []
+        stack: list[collections.abc.Iterator[Clause | Logic | ClauseExpression]] = [iter(self._parts)]
+        while stack:
+            for part in stack[-1]:
+                if not isinstance(part, ClauseExpression):
+                    postfix.append(part)
+                elif part._postfix is not None:
+                    postfix.extend(part._postfix)
+                else:
+                    stack.append(iter(part._parts))
+                    break
+            else:
+                stack.pop()
+        return tuple(postfix)
 
     @staticmethod
     def _assure_filter_clause(
         clauses: collections.abc.Iterable[Clause | Logic],
     ) -> collections.abc.Generator[Clause | Logic, None, None]:
         for c in clauses:
-            if c is Logic.AND or c is Logic.OR or zodchy.codex.operator.FilterBit in c.operation.__class__.__mro__:
+            if c is Logic.AND or c is Logic.OR:
                 yield c
             else:
-                raise ValueError(f"Expected a filter clause, got {c.operation}")
+                yield _checked(c)
+
+
+_filter_operations: dict[type, bool] = {}
+
+
+def _checked(clause: typing.Any) -> Clause:
+    kind = type(clause.operation)
+    try:
+        is_filter = _filter_operations[kind]
+    except KeyError:
+        is_filter = _filter_operations[kind] = zodchy.codex.operator.FilterBit in kind.__mro__
+    if not is_filter:
+        raise ValueError(f"Expected a filter clause, got {clause.operation}")
+    return typing.cast(Clause, clause)
@@ -0,0 +1,4 @@
+from . import streaming
+from .cache import ResultCache, ResultCacheInfo
+from .loading import Loader
+from .routing import Balancing, BatchResult, Executor, ExecutorInfo, Page, PoolInfo
@@ -0,0 +1,157 @@
+import collections
+import collections.abc
+import sys
+import time
+import typing
+
+import sqlalchemy
+from sqlalchemy import event
+from sqlalchemy.engine import FrozenResult
+from sqlalchemy.ext.asyncio import AsyncConnection
+from sqlalchemy.sql import util as sql_util
+
+Key: typing.TypeAlias = collections.abc.Hashable
+
+
+class ResultCacheInfo(typing.NamedTuple):
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+    nbytes: int
+
+
+class _Entry(typing.NamedTuple):
+    result: FrozenResult
+    tables: frozenset[sqlalchemy.Table]
+    expires: float
+    nbytes: int
+
+
+class ResultCache:
+    def __init__(self, maxsize: int = 1024, ttl: float | None = None, max_bytes: int | None = None):
+        if maxsize < 1:
+            raise ValueError(f"Expected a positive cache size, got {maxsize}")
+        if ttl is not None and ttl <= 0:
+            raise ValueError(f"Expected a positive ttl, got {ttl}")
+        if max_bytes is not None and max_bytes < 1:
+            raise ValueError(f"Expected a positive memory bound, got {max_bytes}")
+        self._maxsize = maxsize
+        self._ttl = ttl
+        self._max_bytes = max_bytes
+        self._entries: collections.OrderedDict[Key, _Entry] = collections.OrderedDict()
+        self._by_table: dict[sqlalchemy.Table, set[Key]] = {}
+        self._invalidated: dict[sqlalchemy.Table, int] = {}
+        self._version = 0
+        self._nbytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    @staticmethod
+    def key(statement: sqlalchemy.Select) -> Key | None:
+        cache_key = statement._generate_cache_key()
+        if cache_key is None:
+            return None
+        try:
+            params = tuple(_freeze(bind.effective_value) for bind in cache_key.bindparams)
+            hash(params)
+        except TypeError:
+            return None
+        return cache_key.key, params
+
+    @staticmethod
+    def tables(statement: sqlalchemy.Select) -> frozenset[sqlalchemy.Table]:
+        return frozenset(
+            table
+            for table in sql_util.find_tables(statement, check_columns=True)
+            if isinstance(table, sqlalchemy.Table)
+        )
+
+    def get(self, key: Key) -> FrozenResult | None:
+        entry = self._entries.get(key)
+        if entry is not None and entry.expires < time.monotonic():
+            self._evict(key)
+            entry = None
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry.result
+
+    def put(
+        self,
+        key: Key,
+        result: FrozenResult,
+        tables: collections.abc.Iterable[sqlalchemy.Table],
+        since: int | None = None,
+    ) -> bool:
+        tables = frozenset(tables)
+        if since is not None and any(self._invalidated.get(table, -1) >= since for table in tables):
+            return False
+        nbytes = _size(result)
+        if self._max_bytes is not None and nbytes > self._max_bytes:
+            return False
+        if key in self._entries:
+            self._evict(key)
+        expires = time.monotonic() + self._ttl if self._ttl is not None else float("inf")
+        self._entries[key] = _Entry(result, tables, expires, nbytes)
+        self._nbytes += nbytes
+        for table in tables:
+            self._by_table.setdefault(table, set()).add(key)
+        while len(self._entries) > self._maxsize or (self._max_bytes is not None and self._nbytes > self._max_bytes):
+            self._evict(next(iter(self._entries)))
+        return True
+
+    def invalidate(self, *tables: sqlalchemy.Table) -> int:
+        evicted = 0
+        for table in tables:
+            self._invalidated[table] = self._version
+            for key in tuple(self._by_table.get(table, ())):
+                self._evict(key)
+                evicted += 1
+        self._version += 1
+        return evicted
+
+    def invalidate_on_commit(self, connection: AsyncConnection, *tables: sqlalchemy.Table) -> None:
+        self.invalidate(*tables)
+        sync_connection = connection.sync_connection
+        if sync_connection is not None:
+            event.listen(sync_connection, "commit", lambda _: self.invalidate(*tables), once=True)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._by_table.clear()
+        self._nbytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def info(self) -> ResultCacheInfo:
+        return ResultCacheInfo(self.hits, self.misses, self._maxsize, len(self._entries), self._nbytes)
+
+    def _evict(self, key: Key) -> None:
+        entry = self._entries.pop(key)
+        self._nbytes -= entry.nbytes
+        for table in entry.tables:
+            keys = self._by_table[table]
+            keys.discard(key)
+            if not keys:
+                del self._by_table[table]
+
+
+def _freeze(value: typing.Any) -> typing.Any:
+    if isinstance(value, list | tuple):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def _size(result: FrozenResult) -> int:
+    rows = typing.cast(list[typing.Any], result.data)
+    return sys.getsizeof(rows) + sum(sys.getsizeof(row) + sum(map(sys.getsizeof, row)) for row in rows)
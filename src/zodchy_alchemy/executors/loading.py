@@ -0,0 +1,119 @@
+import asyncio
+import collections
+import collections.abc
+import typing
+
+import sqlalchemy
+import zodchy
+
+from ..assemblers.filters import FilterAssembler
+from ..contracts import Clause
+
+Execute: typing.TypeAlias = collections.abc.Callable[[sqlalchemy.Select], collections.abc.Awaitable[sqlalchemy.Result]]
+Rows: typing.TypeAlias = list[sqlalchemy.Row]
+
+
+class Loader:
+    def __init__(
+        self,
+        execute: Execute,
+        query: sqlalchemy.Select,
+        column: sqlalchemy.Column,
+        filter_assembler: FilterAssembler | None = None,
+        max_batch_size: int = 1000,
+        window: float = 0.0,
+        cache: bool = False,
+        maxsize: int = 1024,
+    ):
+        if max_batch_size < 1:
+            raise ValueError(f"Expected a positive batch size, got {max_batch_size}")
+        if window < 0:
+            raise ValueError(f"Expected a non-negative window, got {window}")
+        if maxsize < 1:
+            raise ValueError(f"Expected a positive cache size, got {maxsize}")
+        index = next((i for i, c in enumerate(query.selected_columns) if c is column), None)
+        if index is None:
+            raise ValueError(f"Expected {column} among the selected columns")
+        self._index = index
+        self._execute = execute
+        self._query = query
+        self._column = column
+        self._filter_assembler = filter_assembler or FilterAssembler()
+        self._max_batch_size = max_batch_size
+        self._window = window
+        self._cache = cache
+        self._maxsize = maxsize
+        self._futures: collections.OrderedDict[typing.Hashable, asyncio.Future[Rows]] = collections.OrderedDict()
+        self._pending: dict[typing.Hashable, asyncio.Future[Rows]] = {}
+        self._dispatch: asyncio.Handle | None = None
+        self._tasks: set[asyncio.Task] = set()
+        self.batches = 0
+
+    def load(self, key: typing.Hashable) -> asyncio.Future[Rows]:
+        future = self._futures.get(key) if self._cache else self._pending.get(key)
+        if future is not None:
+            if self._cache:
+                self._futures.move_to_end(key)
+            return future
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        if self._cache:
+            self._remember(key, future)
+        self._pending[key] = future
+        if len(self._pending) >= self._max_batch_size:
+            self._flush()
+        elif self._dispatch is None:
+            self._dispatch = loop.call_later(self._window, self._flush) if self._window else loop.call_soon(self._flush)
+        return future
+
+    async def load_many(self, keys: collections.abc.Iterable[typing.Hashable]) -> list[Rows]:
+        return list(await asyncio.gather(*(self.load(key) for key in keys)))
+
+    def prime(self, key: typing.Hashable, rows: Rows) -> None:
+        if self._cache and key not in self._futures:
+            future = asyncio.get_running_loop().create_future()
+            future.set_result(rows)
+            self._remember(key, future)
+
+    def clear(self, *keys: typing.Hashable) -> None:
+        if not keys:
+            self._futures.clear()
+        for key in keys:
+            self._futures.pop(key, None)
+
+    def _remember(self, key: typing.Hashable, future: asyncio.Future[Rows]) -> None:
+        self._futures[key] = future
+        while len(self._futures) > self._maxsize:
+            self._futures.popitem(last=False)
+
+    def _flush(self) -> None:
+        if self._dispatch is not None:
+            self._dispatch.cancel()
+            self._dispatch = None
+        pending, self._pending = self._pending, {}
+        if pending:
+            task = asyncio.ensure_future(self._run(pending))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, pending: dict[typing.Hashable, asyncio.Future[Rows]]) -> None:
+        self.batches += 1
+        clause = Clause(self._column, zodchy.codex.operator.SET(*pending))
+        try:
+            result = await self._execute(self._query.where(self._filter_assembler(clause)))
+            rows: dict[typing.Hashable, Rows] = {key: [] for key in pending}
+            for row in result:
+                if (matched := rows.get(row[self._index])) is not None:
+                    matched.append(row)
+        except BaseException as error:
+            for key, future in pending.items():
+                if self._futures.get(key) is future:
+                    del self._futures[key]
+                if not future.done():
+                    future.set_exception(error)
+            if not isinstance(error, Exception):
+                raise
+            return
+        for key, future in pending.items():
+            if not future.done():
+                future.set_result(rows[key])
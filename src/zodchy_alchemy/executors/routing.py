@@ -0,0 +1,229 @@
+import asyncio
+import collections.abc
+import contextlib
+import enum
+import itertools
+import time
+import typing
+
+import sqlalchemy
+from sqlalchemy.engine.default import CACHE_HIT
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from .. import contracts
+from ..assemblers.queries import CountStrategy, Pagination
+from ..instrumentation import Observer
+from . import streaming
+from .cache import ResultCache
+
+Statement: typing.TypeAlias = sqlalchemy.Select | sqlalchemy.Insert | sqlalchemy.Update | sqlalchemy.Delete
+
+
+class Balancing(str, enum.Enum):
+    ROUND_ROBIN = "round_robin"
+    LEAST_BUSY = "least_busy"
+
+
+class PoolInfo(typing.NamedTuple):
+    size: int
+    in_use: int
+    waiting: int
+    saturated: int
+
+
+class ExecutorInfo(typing.NamedTuple):
+    primary: PoolInfo
+    replicas: tuple[PoolInfo, ...]
+
+
+class Page(typing.NamedTuple):
+    rows: collections.abc.Sequence[sqlalchemy.Row]
+    total: int
+
+
+class BatchResult(typing.NamedTuple):
+    result: sqlalchemy.Result
+    seconds: float
+
+
+class _Pool:
+    def __init__(self, engine: AsyncEngine, size: int):
+        self.engine = engine
+        self._size = size
+        self._semaphore = asyncio.Semaphore(size)
+        self._in_use = 0
+        self._waiting = 0
+        self._saturated = 0
+
+    @property
+    def load(self) -> int:
+        return self._in_use + self._waiting
+
+    @contextlib.asynccontextmanager
+    async def checkout(self) -> collections.abc.AsyncIterator[AsyncEngine]:
+        if self._semaphore.locked():
+            self._saturated += 1
+        self._waiting += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self._waiting -= 1
+        self._in_use += 1
+        try:
+            yield self.engine
+        finally:
+            self._in_use -= 1
+            self._semaphore.release()
+
+    def info(self) -> PoolInfo:
+        return PoolInfo(self._size, self._in_use, self._waiting, self._saturated)
+
+
+class Executor:
+    def __init__(
+        self,
+        primary: AsyncEngine,
+        replicas: collections.abc.Iterable[AsyncEngine] = (),
+        balancing: Balancing = Balancing.ROUND_ROBIN,
+        pool_size: int = 10,
+        observer: Observer | None = None,
+        result_cache: ResultCache | None = None,
+    ):
+        if pool_size < 1:
+            raise ValueError(f"Expected a positive pool size, got {pool_size}")
+        self._primary = _Pool(primary, pool_size)
+        self._replicas = tuple(_Pool(engine, pool_size) for engine in replicas)
+        self._balancing = Balancing(balancing)
+        self._round_robin = itertools.cycle(self._replicas or (self._primary,))
+        self._observer = observer
+        self._result_cache = result_cache
+
+    async def execute(self, statement: Statement | None) -> sqlalchemy.Result:
+        if statement is None:
+            raise ValueError("Expected a statement, got None")
+        if self._result_cache is not None:
+            return await self._cached(statement, self._result_cache)
+        return await self._run(statement)
+
+    async def _run(self, statement: Statement) -> sqlalchemy.CursorResult:
+        if self._observer is not None:
+            return await self._observed(statement, self._observer)
+        if self._is_read(statement):
+            async with self.read_transaction() as connection:
+                return await connection.execute(statement)
+        async with self.write_transaction() as connection:
+            return await connection.execute(statement)
+
+    async def _cached(self, statement: Statement, cache: ResultCache) -> sqlalchemy.Result:
+        if not self._is_read(statement):
+            result = await self._run(statement)
+            if isinstance(table := getattr(statement, "table", None), sqlalchemy.Table):
+                cache.invalidate(table)
+            return result
+        select = typing.cast(sqlalchemy.Select, statement)
+        if (key := cache.key(select)) is None:
+            return await self._run(statement)
+        frozen = cache.get(key)
+        if self._observer is not None:
+            self._observer.record("executor.result_cache.hit", frozen is not None)
+        if frozen is None:
+            since = cache.version
+            frozen = (await self._run(statement)).freeze()
+            cache.put(key, frozen, cache.tables(select), since)
+        return frozen()
+
+    async def _observed(self, statement: Statement, observer: Observer) -> sqlalchemy.CursorResult:
+        read = self._is_read(statement)
+        started = time.perf_counter()
+        async with self.read_transaction() if read else self.write_transaction() as connection:
+            result = await connection.execute(statement)
+        observer.record(f"executor.{'read' if read else 'write'}.seconds", time.perf_counter() - started)
+        observer.record("executor.compiled_cache.hit", getattr(result.context, "cache_hit", None) is CACHE_HIT)
+        return result
+
+    async def gather(
+        self, statements: collections.abc.Mapping[str, sqlalchemy.Select], concurrency: int | None = None
+    ) -> dict[str, BatchResult]:
+        if concurrency is not None and concurrency < 1:
+            raise ValueError(f"Expected a positive concurrency, got {concurrency}")
+        semaphore = asyncio.Semaphore(concurrency or len(statements) or 1)
+
+        async def run(statement: sqlalchemy.Select) -> BatchResult:
+            async with semaphore:
+                started = time.perf_counter()
+                result = await self.execute(statement)
+                return BatchResult(result, time.perf_counter() - started)
+
+        tasks = {name: asyncio.ensure_future(run(statement)) for name, statement in statements.items()}
+        if not tasks:
+            return {}
+        try:
+            done, pending = await asyncio.wait(tasks.values(), return_when=asyncio.FIRST_EXCEPTION)
+        finally:
+            for task in tasks.values():
+                task.cancel()
+        for task in done:
+            if not task.cancelled() and (error := task.exception()) is not None:
+                await asyncio.gather(*pending, return_exceptions=True)
+                raise error
+        return {name: task.result() for name, task in tasks.items()}
+
+    async def fetch_page(self, pagination: Pagination, concurrent: bool = False) -> Page:
+        if pagination.strategy is CountStrategy.WINDOW:
+            async with self.read_transaction() as connection:
+                frozen = (await connection.execute(pagination.query)).freeze()
+                if (first := frozen().first()) is None:
+                    return Page([], (await connection.execute(pagination.count_query)).scalar_one())
+                width = len(first) - 1
+                return Page(frozen().columns(*range(width)).all(), first[width])
+        if concurrent:
+            rows, total = await asyncio.gather(self._read(pagination.query), self._read(pagination.count_query))
+            return Page(rows.all(), total.scalar_one())
+        async with self.read_transaction() as connection:
+            rows = await connection.execute(pagination.query)
+            total = await connection.execute(pagination.count_query)
+            return Page(rows.all(), total.scalar_one())
+
+    async def stream(
+        self,
+        statement: sqlalchemy.Select,
+        batch_size: int = 1000,
+        serializer: collections.abc.Callable[[sqlalchemy.Row], typing.Any] | None = None,
+    ) -> collections.abc.AsyncGenerator[list[typing.Any], None]:
+        async with self.read_transaction() as connection:
+            async with contextlib.aclosing(streaming.stream(connection, statement, batch_size, serializer)) as batches:
+                async for batch in batches:
+                    yield batch
+
+    async def _read(self, statement: sqlalchemy.Select) -> sqlalchemy.CursorResult:
+        async with self.read_transaction() as connection:
+            return await connection.execute(statement)
+
+    @contextlib.asynccontextmanager
+    async def read_transaction(self) -> collections.abc.AsyncIterator[contracts.ReadConnectionContract]:
+        async with self._replica().checkout() as engine, engine.connect() as connection:
+            async with connection.begin():
+                yield typing.cast(contracts.ReadConnectionContract, connection)
+
+    @contextlib.asynccontextmanager
+    async def write_transaction(self) -> collections.abc.AsyncIterator[contracts.WriteConnectionContract]:
+        async with self._primary.checkout() as engine, engine.begin() as connection:
+            yield typing.cast(contracts.WriteConnectionContract, connection)
+
+    def info(self) -> ExecutorInfo:
+        return ExecutorInfo(self._primary.info(), tuple(replica.info() for replica in self._replicas))
+
+    async def dispose(self) -> None:
+        for pool in (self._primary, *self._replicas):
+            await pool.engine.dispose()
+
+    def _replica(self) -> _Pool:
+        if not self._replicas:
+            return self._primary
+        if self._balancing is Balancing.LEAST_BUSY:
+            return min(self._replicas, key=lambda pool: pool.load)
+        return next(self._round_robin)
+
+    @staticmethod
+    def _is_read(statement: Statement) -> bool:
+        return isinstance(statement, sqlalchemy.Select) and statement._for_update_arg is None
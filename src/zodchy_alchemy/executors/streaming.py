@@ -0,0 +1,24 @@
+import collections.abc
+import typing
+
+import sqlalchemy
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from ..serializers.row import RowSerializer
+
+
+async def stream(
+    connection: AsyncConnection,
+    statement: sqlalchemy.Select,
+    batch_size: int = 1000,
+    serializer: collections.abc.Callable[[sqlalchemy.Row], typing.Any] | None = None,
+) -> collections.abc.AsyncGenerator[list[typing.Any], None]:
+    if batch_size < 1:
+        raise ValueError(f"Expected a positive batch size, got {batch_size}")
+    result = await connection.stream(statement, execution_options={"yield_per": batch_size})
+    try:
+        serialize = serializer or RowSerializer(result.keys())
+        async for partition in result.partitions():
+            yield [serialize(row) for row in partition]
+    finally:
+        await result.close()
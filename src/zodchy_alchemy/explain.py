@@ -0,0 +1,215 @@
+import collections.abc
+import enum
+import json
+import re
+import typing
+
+import sqlalchemy
+from sqlalchemy.ext.asyncio import AsyncConnection
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.base import Executable
+from sqlalchemy.sql.compiler import SQLCompiler
+from sqlalchemy.sql.elements import ClauseElement
+
+Statement: typing.TypeAlias = sqlalchemy.Select | sqlalchemy.Insert | sqlalchemy.Update | sqlalchemy.Delete
+
+_SQLITE_ACCESS = re.compile(
+    r"^(?P<operation>SCAN|SEARCH)(?: TABLE)? (?P<relation>\S+)(?: AS \S+)?(?P<virtual> VIRTUAL TABLE)?"
+    r"(?: USING (?:(?P<automatic>AUTOMATIC )?(?:COVERING )?INDEX (?P<index>\S+)|(?P<key>(?:INTEGER )?PRIMARY KEY)))?"
+)
+_POSTGRESQL_LOOKUPS = ("Index Cond", "Recheck Cond")
+
+
+class Access(str, enum.Enum):
+    FULL_SCAN = "full_scan"
+    INDEX_SCAN = "index_scan"
+    INDEX_LOOKUP = "index_lookup"
+    SORT = "sort"
+    JOIN = "join"
+    OTHER = "other"
+
+
+class Issue(str, enum.Enum):
+    FULL_SCAN = "full_scan"
+    TEMP_SORT = "temp_sort"
+    NESTED_LOOP = "nested_loop"
+
+
+class PlanNode(typing.NamedTuple):
+    access: Access
+    operation: str
+    relation: str | None = None
+    index_name: str | None = None
+    rows: float | None = None
+    children: tuple["PlanNode", ...] = ()
+
+    def walk(self) -> collections.abc.Iterator["PlanNode"]:
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            yield node
+            stack.extend(reversed(node.children))
+
+    def signature(self) -> dict[str, typing.Any]:
+        signature: dict[str, typing.Any] = {"access": self.access.value, "operation": self.operation}
+        if self.relation is not None:
+            signature["relation"] = self.relation
+        if self.index_name is not None:
+            signature["index"] = self.index_name
+        if self.children:
+            signature["children"] = [child.signature() for child in self.children]
+        return signature
+
+
+class PlanIssue(typing.NamedTuple):
+    issue: Issue
+    node: PlanNode
+
+    def __str__(self) -> str:
+        target = f" on {self.node.relation}" if self.node.relation else ""
+        return f"{self.issue.value}{target}: {self.node.operation}"
+
+
+class Plan(typing.NamedTuple):
+    dialect: str
+    nodes: tuple[PlanNode, ...]
+
+    def walk(self) -> collections.abc.Iterator[PlanNode]:
+        for node in self.nodes:
+            yield from node.walk()
+
+    def signature(self) -> list[dict[str, typing.Any]]:
+        return [node.signature() for node in self.nodes]
+
+    def issues(self) -> list[PlanIssue]:
+        issues = []
+        for node in self.walk():
+            if node.access is Access.FULL_SCAN:
+                issues.append(PlanIssue(Issue.FULL_SCAN, node))
+            elif node.access is Access.SORT:
+                issues.append(PlanIssue(Issue.TEMP_SORT, node))
+        issues.extend(PlanIssue(Issue.NESTED_LOOP, node) for node in _nested_loops(self.nodes, None))
+        return issues
+
+
+class _Explain(Executable, ClauseElement):
+    inherit_cache = False
+
+    def __init__(self, statement: Statement):
+        self.statement = statement
+
+
+def _process(element: _Explain, compiler: SQLCompiler, **kw: typing.Any) -> str:
+    text = compiler.process(element.statement, **kw)
+    compiler.isinsert = compiler.isupdate = compiler.isdelete = False
+    return text
+
+
+@compiles(_Explain)
+def _compile_explain(element: _Explain, compiler: SQLCompiler, **kw: typing.Any) -> str:
+    return f"EXPLAIN {_process(element, compiler, **kw)}"
+
+
+@compiles(_Explain, "sqlite")
+def _compile_explain_sqlite(element: _Explain, compiler: SQLCompiler, **kw: typing.Any) -> str:
+    return f"EXPLAIN QUERY PLAN {_process(element, compiler, **kw)}"
+
+
+@compiles(_Explain, "postgresql")
+def _compile_explain_postgresql(element: _Explain, compiler: SQLCompiler, **kw: typing.Any) -> str:
+    return f"EXPLAIN (FORMAT JSON) {_process(element, compiler, **kw)}"
+
+
+async def explain(connection: AsyncConnection, statement: Statement) -> Plan:
+    dialect = connection.dialect.name
+    if dialect not in _PARSERS:
+        raise ValueError(f"Explain is not supported on {dialect}")
+    result = await connection.execute(_Explain(statement))
+    return parse(dialect, result.all())
+
+
+def parse(dialect: str, rows: collections.abc.Sequence[collections.abc.Sequence[typing.Any]]) -> Plan:
+    parser = _PARSERS.get(dialect)
+    if parser is None:
+        raise ValueError(f"Explain is not supported on {dialect}")
+    return Plan(dialect, parser(rows))
+
+
+def _parse_sqlite(rows: collections.abc.Sequence[collections.abc.Sequence[typing.Any]]) -> tuple[PlanNode, ...]:
+    children: dict[int, list[tuple[int, str]]] = {}
+    for node_id, parent, _, detail in rows:
+        children.setdefault(parent, []).append((node_id, detail))
+
+    def build(parent: int) -> tuple[PlanNode, ...]:
+        return tuple(_sqlite_node(detail, build(node_id)) for node_id, detail in children.get(parent, ()))
+
+    return build(0)
+
+
+def _sqlite_node(detail: str, children: tuple[PlanNode, ...]) -> PlanNode:
+    if detail.startswith("USE TEMP B-TREE"):
+        return PlanNode(Access.SORT, detail, children=children)
+    match = _SQLITE_ACCESS.match(detail)
+    if match is None:
+        return PlanNode(Access.OTHER, detail, children=children)
+    relation = match["relation"]
+    index = match["index"] or match["key"]
+    if match["virtual"]:
+        return PlanNode(Access.OTHER, match["operation"], relation, children=children)
+    if match["automatic"]:
+        access, index = Access.FULL_SCAN, None
+    elif match["operation"] == "SEARCH":
+        access = Access.INDEX_LOOKUP
+    elif index is not None:
+        access = Access.INDEX_SCAN
+    elif relation == "CONSTANT":
+        return PlanNode(Access.OTHER, detail, children=children)
+    else:
+        access = Access.FULL_SCAN
+    return PlanNode(access, match["operation"], relation, index, children=children)
+
+
+def _parse_postgresql(rows: collections.abc.Sequence[collections.abc.Sequence[typing.Any]]) -> tuple[PlanNode, ...]:
+    document = rows[0][0]
+    if isinstance(document, str):
+        document = json.loads(document)
+    return tuple(_postgresql_node(entry["Plan"]) for entry in document)
+
+
+def _postgresql_node(plan: dict[str, typing.Any]) -> PlanNode:
+    operation = plan["Node Type"]
+    children = tuple(_postgresql_node(child) for child in plan.get("Plans", ()))
+    if operation == "Seq Scan":
+        access = Access.FULL_SCAN
+    elif "Index" in operation or operation == "Bitmap Heap Scan":
+        access = Access.INDEX_LOOKUP if any(key in plan for key in _POSTGRESQL_LOOKUPS) else Access.INDEX_SCAN
+    elif operation.endswith("Sort"):
+        access = Access.SORT
+    elif operation in ("Nested Loop", "Hash Join", "Merge Join"):
+        access = Access.JOIN
+    else:
+        access = Access.OTHER
+    return PlanNode(
+        access, operation, plan.get("Relation Name"), plan.get("Index Name"), plan.get("Plan Rows"), children
+    )
+
+
+def _nested_loops(nodes: tuple[PlanNode, ...], parent: PlanNode | None) -> collections.abc.Iterator[PlanNode]:
+    if parent is not None and parent.operation == "Nested Loop":
+        inner = nodes[1:]
+        for node in inner:
+            yield from (child for child in node.walk() if child.access is Access.FULL_SCAN)
+    elif parent is None or parent.access is not Access.JOIN:
+        loops = [node for node in nodes if node.access in (Access.FULL_SCAN, Access.INDEX_SCAN, Access.INDEX_LOOKUP)]
+        yield from (node for node in loops[1:] if node.access is Access.FULL_SCAN)
+    for node in nodes:
+        yield from _nested_loops(node.children, node)
+
+
+_PARSERS: dict[
+    str,
+    collections.abc.Callable[[collections.abc.Sequence[collections.abc.Sequence[typing.Any]]], tuple[PlanNode, ...]],
+] = {
+    "sqlite": _parse_sqlite,
+    "postgresql": _parse_postgresql,
+}
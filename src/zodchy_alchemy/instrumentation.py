@@ -0,0 +1,122 @@
+import bisect
+import collections.abc
+import math
+import time
+import typing
+
+_BOUNDS: tuple[float, ...] = tuple(2.0**exponent for exponent in range(-20, 21))
+
+
+class Observer(typing.Protocol):
+    def record(self, metric: str, value: float) -> None: ...
+
+
+class Histogram(typing.NamedTuple):
+    samples: int
+    total: float
+    minimum: float
+    maximum: float
+    buckets: tuple[tuple[float, int], ...]
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.samples if self.samples else 0.0
+
+    def quantile(self, q: float) -> float:
+        if not 0 <= q <= 1:
+            raise ValueError(f"Expected a quantile between 0 and 1, got {q}")
+        rank = q * self.samples
+        seen = 0
+        for bound, count in self.buckets:
+            seen += count
+            if seen >= rank and count:
+                return min(bound, self.maximum)
+        return self.maximum
+
+
+class Exporter(typing.Protocol):
+    def export(self, histograms: collections.abc.Mapping[str, Histogram]) -> None: ...
+
+
+class _Series:
+    __slots__ = ("count", "total", "minimum", "maximum", "buckets")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.minimum = math.inf
+        self.maximum = -math.inf
+        self.buckets = [0] * (len(_BOUNDS) + 1)
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        self.total += value
+        self.minimum = min(self.minimum, value)
+        self.maximum = max(self.maximum, value)
+        self.buckets[bisect.bisect_left(_BOUNDS, value)] += 1
+
+    def snapshot(self) -> Histogram:
+        bounds = (*_BOUNDS, math.inf)
+        return Histogram(
+            self.count,
+            self.total,
+            self.minimum,
+            self.maximum,
+            tuple((bound, count) for bound, count in zip(bounds, self.buckets, strict=True) if count),
+        )
+
+
+class HistogramCollector:
+    def __init__(self) -> None:
+        self._series: dict[str, _Series] = {}
+
+    def record(self, metric: str, value: float) -> None:
+        series = self._series.get(metric)
+        if series is None:
+            series = self._series[metric] = _Series()
+        series.add(value)
+
+    def snapshot(self) -> dict[str, Histogram]:
+        return {metric: series.snapshot() for metric, series in self._series.items()}
+
+    def export(self, exporter: Exporter, reset: bool = False) -> None:
+        exporter.export(self.snapshot())
+        if reset:
+            self.clear()
+
+    def clear(self) -> None:
+        self._series.clear()
+
+
+class Stopwatch:
+    __slots__ = ("_observer", "_prefix", "_last")
+
+    def __init__(self, observer: Observer, prefix: str):
+        self._observer = observer
+        self._prefix = prefix
+        self._last = time.perf_counter()
+
+    def lap(self, phase: str) -> None:
+        now = time.perf_counter()
+        self._observer.record(f"{self._prefix}.{phase}.seconds", now - self._last)
+        self._last = now
+
+    def record(self, metric: str, value: float) -> None:
+        self._observer.record(f"{self._prefix}.{metric}", value)
+
+
+class _IdleStopwatch:
+    __slots__ = ()
+
+    def lap(self, phase: str) -> None:
+        pass
+
+    def record(self, metric: str, value: float) -> None:
+        pass
+
+
+_IDLE = _IdleStopwatch()
+
+
+def stopwatch(observer: Observer | None, prefix: str) -> Stopwatch | _IdleStopwatch:
+    return _IDLE if observer is None else Stopwatch(observer, prefix)
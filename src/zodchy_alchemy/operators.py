@@ -0,0 +1,47 @@
+import enum
+import typing
+
+import zodchy
+
+T = typing.TypeVar("T")
+
+
+class LikeMode(str, enum.Enum):
+    CONTAINS = "contains"
+    PREFIX = "prefix"
+    SUFFIX = "suffix"
+    EXACT = "exact"
+
+
+class LIKE(zodchy.codex.operator.LIKE[T]):
+    def __init__(self, value: T, case_sensitive: bool = False, mode: LikeMode = LikeMode.CONTAINS):
+        super().__init__(value, case_sensitive)
+        self._mode = LikeMode(mode)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, LIKE):
+            return NotImplemented
+        return super().__eq__(other) and self._mode is other.mode
+
+    @property
+    def mode(self) -> LikeMode:
+        return self._mode
+
+
+class SEARCH(zodchy.codex.operator.FilterBit[T]):
+    def __init__(self, value: T, config: str | None = None):
+        super().__init__(value)
+        self._config = config
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, SEARCH):
+            return NotImplemented
+        return bool(self._data == other.value) and self._config == other.config
+
+    @property
+    def config(self) -> str | None:
+        return self._config
+
+
+def like_mode(operation: typing.Any) -> LikeMode:
+    return typing.cast(LikeMode, getattr(operation, "mode", LikeMode.CONTAINS))
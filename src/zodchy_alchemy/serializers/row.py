@@ -1,8 +1,13 @@
+import collections.abc
 import typing
 import uuid
 from functools import singledispatch
 
-from sqlalchemy import Row
+from sqlalchemy import Result, Row
+
+Converter: typing.TypeAlias = collections.abc.Callable[[typing.Any], typing.Any]
+
+_RESOLVE_ROWS = 64
 
 
 def to_dict(data: Row) -> dict[str, typing.Any]:
@@ -17,6 +22,48 @@ def field_serializer(value: typing.Any) -> typing.Any:
     return value
 
 
+class RowSerializer:
+    __slots__ = ("_keys", "_pending", "_converters", "_attempts")
+
+    def __init__(self, keys: collections.abc.Iterable[str]):
+        self._keys = tuple(keys)
+        self._pending = tuple(range(len(self._keys)))
+        self._converters: tuple[tuple[int, str, Converter], ...] = ()
+        self._attempts = 0
+
+    def __call__(self, row: Row) -> dict[str, typing.Any]:
+        if self._pending:
+            self._resolve(row)
+        result = dict(zip(self._keys, row, strict=True))
+        for index, key, converter in self._converters:
+            if (value := row[index]) is not None:
+                result[key] = converter(value)
+        return result
+
+    def _resolve(self, row: Row) -> None:
+        self._attempts += 1
+        if self._attempts > _RESOLVE_ROWS:
+            self._converters += tuple((index, self._keys[index], field_serializer) for index in self._pending)
+            self._pending = ()
+            return
+        pending = tuple(index for index in self._pending if row[index] is None)
+        if len(pending) == len(self._pending):
+            return
+        identity = field_serializer.dispatch(object)
+        converters = []
+        for index in self._pending:
+            value = row[index]
+            if value is not None and (converter := field_serializer.dispatch(type(value))) is not identity:
+                converters.append((index, self._keys[index], converter))
+        self._pending = pending
+        if converters:
+            self._converters += tuple(converters)
+
+
+def row_serializer(result: Result) -> RowSerializer:
+    return RowSerializer(result.keys())
+
+
 try:
     import asyncpg.pgproto.pgproto  # type: ignore[import-not-found]
 
@@ -0,0 +1,76 @@
+import collections.abc
+import json
+import pathlib
+import typing
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from .explain import Plan, Statement, explain
+
+
+class PlanSnapshots:
+    def __init__(self, directory: pathlib.Path, update: bool = False):
+        self._directory = directory
+        self._update = update
+
+    async def check(self, connection: AsyncConnection, name: str, statement: Statement) -> Plan:
+        plan = await explain(connection, statement)
+        if (failure := self._compare(name, plan)) is not None:
+            raise AssertionError(failure)
+        return plan
+
+    async def check_all(
+        self, connection: AsyncConnection, shapes: collections.abc.Mapping[str, Statement]
+    ) -> dict[str, Plan]:
+        plans = {}
+        failures = []
+        for name, statement in shapes.items():
+            plans[name] = plan = await explain(connection, statement)
+            if (failure := self._compare(name, plan)) is not None:
+                failures.append(failure)
+        if failures:
+            raise AssertionError("\n\n".join(failures))
+        return plans
+
+    def _compare(self, name: str, plan: Plan) -> str | None:
+        path = self._directory / plan.dialect / f"{name}.json"
+        signature: dict[str, typing.Any] = {
+            "plan": plan.signature(),
+            "issues": sorted(str(issue) for issue in plan.issues()),
+        }
+        if self._update or not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(json.dumps(signature, indent=2, sort_keys=True) + "\n")
+            return None
+        expected = json.loads(path.read_text())
+        if expected == signature:
+            return None
+        introduced = sorted(set(signature["issues"]) - set(expected.get("issues", ())))
+        return "\n".join(
+            [
+                f"Query plan for {name} changed ({path}), rerun with --update-plans if intended",
+                *(f"  new issue: {issue}" for issue in introduced),
+                f"  expected: {json.dumps(expected['plan'], sort_keys=True)}",
+                f"  actual:   {json.dumps(signature['plan'], sort_keys=True)}",
+            ]
+        )
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    parser.addoption(
+        "--update-plans",
+        action="store_true",
+        default=False,
+        help="rewrite stored query plan snapshots",
+    )
+
+
+@pytest.fixture
+def plan_snapshot_dir(request: pytest.FixtureRequest) -> pathlib.Path:
+    return request.path.parent / "plans"
+
+
+@pytest.fixture
+def plan_snapshots(request: pytest.FixtureRequest, plan_snapshot_dir: pathlib.Path) -> PlanSnapshots:
+    return PlanSnapshots(plan_snapshot_dir, bool(request.config.getoption("--update-plans", default=False)))
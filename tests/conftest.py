@@ -3,6 +3,8 @@ import sqlalchemy  # type: ignore[import-not-found]
 
 from . import schema
 
+pytest_plugins = ("zodchy_alchemy.testing",)
+
 
 @pytest.fixture(scope="session")
 def base_query():
@@ -0,0 +1,71 @@
+import copy
+
+import pytest
+
+from zodchy.codex import operator
+
+from zodchy_alchemy import contracts
+
+from . import schema
+
+
+def _clause(value):
+    return contracts.Clause(schema.firmware.c.version, operator.EQ(value))
+
+
+def test_composition_keeps_postfix_order():
+    a, b, c, d = (_clause(v) for v in "abcd")
+    expression = ((a & b) | c) & (d | a)
+    assert list(expression) == [
+        c,
+        b,
+        a,
+        contracts.Logic.AND,
+        contracts.Logic.OR,
+        a,
+        d,
+        contracts.Logic.OR,
+        contracts.Logic.AND,
+    ]
+    assert list(expression) == list(expression)
+
+
+def test_composition_shares_operands():
+    a, b = _clause("a"), _clause("b")
+    left = contracts.ClauseExpression(a)
+    combined = left & b
+    assert list(left) == [a]
+    assert list(combined) == [b, a, contracts.Logic.AND]
+
+
+def test_long_chains_flatten_without_recursion():
+    expression = contracts.ClauseExpression(_clause(0))
+    for i in range(1, 50_000):
+        expression = expression & _clause(i)
+    postfix = list(expression)
+    assert len(postfix) == 2 * 50_000 - 1
+    assert postfix[-1] is contracts.Logic.AND
+
+
+def test_clause_is_immutable():
+    clause = _clause("a")
+    with pytest.raises(AttributeError, match="Clause is immutable"):
+        clause.column = schema.firmware.c.id
+    assert not hasattr(clause, "__dict__")
+
+
+def test_clause_copies_through_constructor():
+    clause = contracts.Clause(schema.hardware.c.revision, operator.EQ("01"), schema.hardware_firmware)
+    shallow = copy.copy(clause)
+    assert shallow is not clause and shallow.dump() == clause.dump()
+    deep = copy.deepcopy(clause)
+    assert deep.column.name == "revision" and deep.operation.value == "01"
+    assert [table.name for table in deep.conditions] == ["hardware_firmware"]
+
+
+def test_rejects_non_filter_clauses():
+    order = contracts.Clause(schema.firmware.c.id, operator.ASC())
+    with pytest.raises(ValueError, match="Expected a filter clause"):
+        contracts.ClauseExpression(order)
+    with pytest.raises(ValueError, match="Expected a filter clause"):
+        contracts.ClauseExpression(_clause("a")) & order
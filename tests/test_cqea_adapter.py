@@ -75,3 +75,40 @@ def test_query_adapter_raises_for_unknown_column():
 
     with pytest.raises(ValueError, match="Column missing not found"):
         list(adapter(query))
+
+
+class FirmwareQuery(cqea.Query):
+    version: operator.EQ[str]
+    uri: operator.LIKE[str]
+    tag: str
+    limit: operator.Limit | None
+
+    def __init__(self, **values: typing.Any):
+        self._values = values
+
+    def __iter__(self):
+        yield from self._values.items()
+
+
+def test_query_adapter_compiles_query_class_once():
+    adapter = QueryAdapter(
+        names_map={"tag": lambda value: contracts.Clause(schema.tag.c.name, operator.EQ(value))},
+        default_table=schema.firmware,
+    )
+    plan = adapter.compile(FirmwareQuery)
+    assert plan["version"] is schema.firmware.c.version
+    assert plan["uri"] is schema.firmware.c.uri
+    assert adapter.compile(FirmwareQuery) is plan
+
+    result = list(adapter(FirmwareQuery(version=operator.EQ("1.0"), tag="stable", limit=operator.Limit(5))))
+    assert [(item.column, type(item.operation)) for item in result[:2]] == [
+        (schema.firmware.c.version, operator.EQ),
+        (schema.tag.c.name, operator.EQ),
+    ]
+    assert isinstance(result[2], operator.Limit)
+
+
+def test_query_adapter_compile_fails_fast_on_unknown_columns():
+    adapter = QueryAdapter(default_table=schema.hardware)
+    with pytest.raises(ValueError, match="Column version not found"):
+        adapter.compile(FirmwareQuery)
@@ -0,0 +1,315 @@
+import asyncio
+import contextlib
+
+import pytest
+import sqlalchemy  # type: ignore[import-not-found]
+from sqlalchemy.ext.asyncio import create_async_engine  # type: ignore[import-not-found]
+
+from zodchy.codex import operator
+
+from zodchy_alchemy import (
+    Balancing,
+    CountStrategy,
+    Executor,
+    MutationAssembler,
+    QueryAssembler,
+    ResultCache,
+    contracts,
+)
+from zodchy_alchemy.executors import cache as cache_module
+
+metadata = sqlalchemy.MetaData()
+events = sqlalchemy.Table(
+    "events",
+    metadata,
+    sqlalchemy.Column("id", sqlalchemy.Integer, primary_key=True),
+    sqlalchemy.Column("source", sqlalchemy.String),
+)
+other = sqlalchemy.Table(
+    "other",
+    metadata,
+    sqlalchemy.Column("id", sqlalchemy.Integer, primary_key=True),
+    sqlalchemy.Column("event_id", sqlalchemy.ForeignKey(events.c.id)),
+)
+
+
+async def _engine(path, source):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    async with engine.begin() as connection:
+        await connection.run_sync(metadata.create_all)
+        await connection.execute(sqlalchemy.insert(events).values(id=0, source=source))
+    return engine
+
+
+@pytest.fixture
+async def executor(tmp_path):
+    executor = Executor(
+        await _engine(tmp_path / "primary.db", "primary"),
+        [await _engine(tmp_path / f"replica{i}.db", f"replica{i}") for i in range(2)],
+        pool_size=2,
+    )
+    yield executor
+    await executor.dispose()
+
+
+async def _source(executor):
+    query = QueryAssembler(sqlalchemy.select(events.c.source))(contracts.Clause(events.c.id, operator.EQ(0)))
+    return (await executor.execute(query)).scalar_one()
+
+
+async def test_reads_round_robin_over_replicas(executor):
+    assert [await _source(executor) for _ in range(4)] == ["replica0", "replica1", "replica0", "replica1"]
+
+
+async def test_writes_go_to_primary(executor):
+    await executor.execute(MutationAssembler(events)(dict(id=1, source="written")))
+    async with executor.write_transaction() as connection:
+        assert (await connection.execute(sqlalchemy.select(sqlalchemy.func.count()).select_from(events))).scalar() == 2
+    assert await _source(executor) == "replica0"
+
+
+async def test_locking_reads_go_to_primary(executor):
+    query = sqlalchemy.select(events.c.source).with_for_update()
+    assert (await executor.execute(query)).scalar_one() == "primary"
+
+
+async def test_reads_fall_back_to_primary_without_replicas(tmp_path):
+    executor = Executor(await _engine(tmp_path / "primary.db", "primary"))
+    assert await _source(executor) == "primary"
+    await executor.dispose()
+
+
+async def test_write_transaction_rolls_back_on_error(executor):
+    with pytest.raises(RuntimeError):
+        async with executor.write_transaction() as connection:
+            await connection.execute(MutationAssembler(events)(dict(id=1, source="lost")))
+            raise RuntimeError
+    async with executor.write_transaction() as connection:
+        assert (await connection.execute(sqlalchemy.select(events.c.id))).scalars().all() == [0]
+
+
+async def test_least_busy_picks_idle_replica(tmp_path):
+    executor = Executor(
+        await _engine(tmp_path / "primary.db", "primary"),
+        [await _engine(tmp_path / f"replica{i}.db", f"replica{i}") for i in range(2)],
+        balancing=Balancing.LEAST_BUSY,
+    )
+    async with executor.read_transaction():
+        assert await _source(executor) == "replica1"
+    await executor.dispose()
+
+
+async def test_pool_saturation_is_reported(executor):
+    released = asyncio.Event()
+
+    async def hold():
+        async with executor.write_transaction():
+            await released.wait()
+
+    holders = [asyncio.create_task(hold()) for _ in range(3)]
+    await asyncio.sleep(0.05)
+    info = executor.info().primary
+    assert (info.size, info.in_use, info.waiting, info.saturated) == (2, 2, 1, 1)
+    released.set()
+    await asyncio.gather(*holders)
+    assert executor.info().primary.in_use == 0
+
+
+async def test_rejects_empty_statement(executor):
+    with pytest.raises(ValueError, match="Expected a statement"):
+        await executor.execute(MutationAssembler(events)())
+
+
+def test_rejects_non_positive_pool_size():
+    with pytest.raises(ValueError, match="Expected a positive pool size"):
+        Executor(create_async_engine("sqlite+aiosqlite://"), pool_size=0)
+
+
+async def _seed(executor, count):
+    await executor.execute(MutationAssembler(events)(*(dict(id=i, source=f"event{i}") for i in range(1, count))))
+
+
+@pytest.mark.parametrize("strategy", [CountStrategy.WINDOW, CountStrategy.SEPARATE])
+@pytest.mark.parametrize("concurrent", [False, True])
+async def test_fetch_page_with_total(tmp_path, strategy, concurrent):
+    executor = Executor(await _engine(tmp_path / "primary.db", "primary"))
+    await _seed(executor, 25)
+    assembler = QueryAssembler(sqlalchemy.select(events.c.id, events.c.source))
+    order = contracts.Clause(events.c.id, operator.ASC())
+
+    page = await executor.fetch_page(
+        assembler.paginate(order, operator.Limit(10), operator.Offset(20), strategy=strategy), concurrent
+    )
+    assert [tuple(row) for row in page.rows] == [(i, f"event{i}") for i in range(20, 25)]
+    assert page.total == 25
+
+    page = await executor.fetch_page(assembler.paginate(order, operator.Offset(30), strategy=strategy), concurrent)
+    assert list(page.rows) == [] and page.total == 25
+    await executor.dispose()
+
+
+async def test_result_cache_serves_reads_until_write(tmp_path):
+    cache = ResultCache()
+    executor = Executor(await _engine(tmp_path / "primary.db", "primary"), result_cache=cache)
+    assert await _source(executor) == "primary"
+    async with executor.write_transaction() as connection:
+        await connection.execute(sqlalchemy.update(events).values(source="bypassed"))
+    assert await _source(executor) == "primary"
+    assert cache.info()[:2] == (1, 1)
+
+    await executor.execute(
+        MutationAssembler(events)(dict(source="updated"), contracts.Clause(events.c.id, operator.EQ(0)))
+    )
+    assert len(cache) == 0
+    assert await _source(executor) == "updated"
+    await executor.dispose()
+
+
+async def test_bulk_mutations_invalidate_result_cache(tmp_path):
+    cache = ResultCache()
+    executor = Executor(await _engine(tmp_path / "primary.db", "primary"), result_cache=cache)
+    count = sqlalchemy.select(sqlalchemy.func.count()).select_from(events)
+    assert (await executor.execute(count)).scalar_one() == 1
+    async with executor.write_transaction() as connection:
+        await MutationAssembler(events, result_cache=cache).bulk_insert(
+            connection, [dict(id=i, source="bulk") for i in range(1, 4)]
+        )
+    assert (await executor.execute(count)).scalar_one() == 4
+    await executor.dispose()
+
+
+async def test_bulk_mutations_invalidate_result_cache_on_commit(tmp_path):
+    cache = ResultCache()
+    executor = Executor(await _engine(tmp_path / "primary.db", "primary"), result_cache=cache)
+    rows = [{"id": 0, "source": "bulk"}]
+    async with executor.write_transaction() as connection:
+        await MutationAssembler(events, result_cache=cache).bulk_update(connection, rows, events.c.id)
+        assert await _source(executor) == "primary"
+        assert len(cache) == 1
+    assert len(cache) == 0
+    assert await _source(executor) == "bulk"
+    await executor.dispose()
+
+
+def _frozen(*rows):
+    engine = sqlalchemy.create_engine("sqlite://")
+    with engine.connect() as connection:
+        statement = sqlalchemy.union_all(*(sqlalchemy.select(sqlalchemy.literal(row)) for row in rows))
+        return connection.execute(statement).freeze()
+
+
+def test_result_cache_keys_on_statement_and_params():
+    query = QueryAssembler(sqlalchemy.select(events.c.source))
+    first = ResultCache.key(query(contracts.Clause(events.c.id, operator.EQ(1))))
+    assert first == ResultCache.key(query(contracts.Clause(events.c.id, operator.EQ(1))))
+    assert first != ResultCache.key(query(contracts.Clause(events.c.id, operator.EQ(2))))
+    assert ResultCache.key(query(contracts.Clause(events.c.id, operator.SET(1, 2)))) is not None
+
+
+def test_result_cache_records_joined_and_nested_tables():
+    joined = sqlalchemy.select(events.c.id).join(other, other.c.event_id == events.c.id)
+    assert ResultCache.tables(joined) == {events, other}
+    nested = sqlalchemy.select(events.c.id).where(sqlalchemy.exists().where(other.c.event_id == events.c.id))
+    assert ResultCache.tables(nested) == {events, other}
+
+
+def test_result_cache_evicts_lru_and_by_memory():
+    cache = ResultCache(maxsize=2)
+    for key in "abc":
+        cache.put(key, _frozen(1), [events])
+    assert cache.get("a") is None and cache.get("c") is not None
+
+    frozen = _frozen(*range(10))
+    assert ResultCache(max_bytes=1).put("a", frozen, [events]) is False
+    cache = ResultCache()
+    cache.put("a", frozen, [events])
+    cache = ResultCache(max_bytes=cache.info().nbytes * 2)
+    for key in "abc":
+        cache.put(key, frozen, [events])
+    assert len(cache) == 2 and cache.get("a") is None
+
+
+def test_result_cache_expires_entries(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(cache_module.time, "monotonic", lambda: now[0])
+    cache = ResultCache(ttl=10)
+    cache.put("a", _frozen(1), [events])
+    assert cache.get("a") is not None
+    now[0] += 11
+    assert cache.get("a") is None and len(cache) == 0
+
+
+def test_result_cache_rejects_results_invalidated_in_flight():
+    cache = ResultCache()
+    since = cache.version
+    cache.invalidate(other)
+    assert cache.put("a", _frozen(1), [events], since) is True
+    cache.invalidate(events)
+    assert cache.put("b", _frozen(1), [events], since) is False
+    assert cache.get("a") is None
+
+
+async def test_stream_yields_serialized_batches(tmp_path):
+    executor = Executor(await _engine(tmp_path / "primary.db", "primary"))
+    await _seed(executor, 25)
+    query = QueryAssembler(sqlalchemy.select(events.c.id, events.c.source))(
+        contracts.Clause(events.c.id, operator.ASC())
+    )
+    batches = [batch async for batch in executor.stream(query, batch_size=10)]
+    assert [len(batch) for batch in batches] == [10, 10, 5]
+    assert batches[2][-1] == {"id": 24, "source": "event24"}
+
+    async with contextlib.aclosing(executor.stream(query, 10, serializer=lambda row: row.id)) as stream:
+        assert await anext(stream) == list(range(10))
+    assert executor.info().primary.in_use == 0
+
+    with pytest.raises(ValueError, match="Expected a positive batch size"):
+        await anext(executor.stream(query, batch_size=0))
+    await executor.dispose()
+
+
+async def test_gather_runs_named_queries(executor):
+    query = sqlalchemy.select(events.c.source)
+    results = await executor.gather(
+        {"first": query, "count": sqlalchemy.select(sqlalchemy.func.count()).select_from(events)}
+    )
+    assert results["first"].result.scalar_one().startswith("replica")
+    assert results["count"].result.scalar_one() == 1
+    assert all(batch.seconds >= 0 for batch in results.values())
+    assert await executor.gather({}) == {}
+
+
+async def test_gather_caps_concurrency(executor, monkeypatch):
+    running = peak = 0
+
+    async def execute(statement):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return statement
+
+    monkeypatch.setattr(executor, "execute", execute)
+    results = await executor.gather({str(i): i for i in range(6)}, concurrency=2)
+    assert peak == 2 and [batch.result for batch in results.values()] == list(range(6))
+    with pytest.raises(ValueError, match="Expected a positive concurrency"):
+        await executor.gather({}, concurrency=0)
+
+
+async def test_gather_cancels_on_first_error(executor, monkeypatch):
+    cancelled = []
+
+    async def execute(statement):
+        if statement == "fail":
+            raise RuntimeError(statement)
+        try:
+            await asyncio.sleep(1)
+        except asyncio.CancelledError:
+            cancelled.append(statement)
+            raise
+
+    monkeypatch.setattr(executor, "execute", execute)
+    with pytest.raises(RuntimeError, match="fail"):
+        await executor.gather({"slow": "slow", "fail": "fail", "other": "other"})
+    assert sorted(cancelled) == ["other", "slow"]
@@ -0,0 +1,126 @@
+import json
+
+import pytest
+import sqlalchemy  # type: ignore[import-not-found]
+from sqlalchemy.ext.asyncio import create_async_engine  # type: ignore[import-not-found]
+from sqlalchemy.pool import NullPool  # type: ignore[import-not-found]
+
+from zodchy.codex import operator
+
+from zodchy_alchemy import FilterAssembler, MutationAssembler, QueryAssembler, contracts
+from zodchy_alchemy.explain import Access, Issue, explain, parse
+from zodchy_alchemy.testing import PlanSnapshots
+
+metadata = sqlalchemy.MetaData()
+owners = sqlalchemy.Table(
+    "owners",
+    metadata,
+    sqlalchemy.Column("id", sqlalchemy.Integer, primary_key=True),
+    sqlalchemy.Column("name", sqlalchemy.String),
+)
+devices = sqlalchemy.Table(
+    "devices",
+    metadata,
+    sqlalchemy.Column("id", sqlalchemy.Integer, primary_key=True),
+    sqlalchemy.Column("serial", sqlalchemy.String, index=True),
+    sqlalchemy.Column("status", sqlalchemy.String),
+    sqlalchemy.Column("owner_name", sqlalchemy.String),
+)
+
+
+@pytest.fixture
+async def connection(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'plans.db'}")
+    async with engine.connect() as connection:
+        await connection.run_sync(metadata.create_all)
+        yield connection
+    await engine.dispose()
+
+
+@pytest.fixture
+def plan_snapshot_dir(tmp_path):
+    return tmp_path / "plans"
+
+
+def _query(*clauses):
+    return QueryAssembler(sqlalchemy.select(devices.c.id))(*clauses)
+
+
+async def test_detects_index_lookup_and_full_scan(connection):
+    lookup = await explain(connection, _query(contracts.Clause(devices.c.serial, operator.EQ("x"))))
+    assert [(node.access, node.relation) for node in lookup.walk()] == [(Access.INDEX_LOOKUP, "devices")]
+    assert lookup.nodes[0].index_name == "ix_devices_serial"
+    assert lookup.issues() == []
+
+    scan = await explain(connection, _query(contracts.Clause(devices.c.status, operator.EQ("x"))))
+    assert [str(issue) for issue in scan.issues()] == ["full_scan on devices: SCAN"]
+
+
+async def test_detects_temp_sort_and_nested_loop(connection):
+    query = (
+        sqlalchemy.select(devices.c.id)
+        .join(owners, owners.c.name == devices.c.owner_name)
+        .where(devices.c.status == "x")
+        .order_by(devices.c.status, owners.c.name)
+    )
+    issues = {issue.issue for issue in (await explain(connection, query)).issues()}
+    assert Issue.TEMP_SORT in issues and Issue.FULL_SCAN in issues
+
+
+async def test_bulk_set_scans_values_as_virtual_table(connection):
+    query = QueryAssembler(sqlalchemy.select(devices.c.id), filter_assembler=FilterAssembler(set_threshold=2))(
+        contracts.Clause(devices.c.serial, operator.SET("a", "b", "c"))
+    )
+    plan = await explain(connection, query)
+    virtual = [node for node in plan.walk() if node.operation == "SCAN" and node.relation != "devices"]
+    assert virtual and all(node.access is Access.OTHER for node in virtual)
+    assert [str(issue) for issue in plan.issues()] == []
+
+
+async def test_explains_mutations_without_running_them(connection):
+    await explain(connection, MutationAssembler(devices)(dict(id=1, serial="a")))
+    update = MutationAssembler(devices)(dict(status="x"), contracts.Clause(devices.c.id, operator.EQ(1)))
+    plan = await explain(connection, update)
+    assert plan.nodes[0].access is Access.INDEX_LOOKUP
+    assert (await connection.execute(sqlalchemy.select(sqlalchemy.func.count()).select_from(devices))).scalar() == 0
+
+
+def test_parses_postgresql_json_plans():
+    document = [
+        {
+            "Plan": {
+                "Node Type": "Sort",
+                "Plans": [
+                    {
+                        "Node Type": "Nested Loop",
+                        "Plans": [
+                            {"Node Type": "Index Scan", "Relation Name": "owners", "Index Name": "owners_pkey"},
+                            {"Node Type": "Seq Scan", "Relation Name": "devices", "Plan Rows": 1000},
+                        ],
+                    }
+                ],
+            }
+        }
+    ]
+    plan = parse("postgresql", [(json.dumps(document),)])
+    assert [node.access for node in plan.walk()] == [Access.SORT, Access.JOIN, Access.INDEX_SCAN, Access.FULL_SCAN]
+    assert sorted(issue.issue.value for issue in plan.issues()) == ["full_scan", "nested_loop", "temp_sort"]
+    with pytest.raises(ValueError, match="not supported on mysql"):
+        parse("mysql", [])
+
+
+async def test_plan_snapshots_fail_when_lookup_turns_into_scan(tmp_path, plan_snapshots, plan_snapshot_dir):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'snapshots.db'}", poolclass=NullPool)
+    shapes = {"by_serial": _query(contracts.Clause(devices.c.serial, operator.EQ("x")))}
+    async with engine.begin() as connection:
+        await connection.run_sync(metadata.create_all)
+        await plan_snapshots.check_all(connection, shapes)
+        assert (plan_snapshot_dir / "sqlite" / "by_serial.json").exists()
+        await plan_snapshots.check(connection, "by_serial", shapes["by_serial"])
+        await connection.execute(sqlalchemy.text("DROP INDEX ix_devices_serial"))
+
+    async with engine.connect() as connection:
+        with pytest.raises(AssertionError, match="new issue: full_scan on devices"):
+            await plan_snapshots.check_all(connection, shapes)
+        await PlanSnapshots(plan_snapshot_dir, update=True).check(connection, "by_serial", shapes["by_serial"])
+        await plan_snapshots.check(connection, "by_serial", shapes["by_serial"])
@@ -1,11 +1,15 @@
+import operator as python_operator
 import uuid
 from datetime import datetime
 
 import pytest
+import sqlalchemy  # type: ignore[import-not-found]
+from sqlalchemy.dialects import postgresql, sqlite  # type: ignore[import-not-found]
 from zodchy.codex import operator
 
-from zodchy_alchemy import FilterAssembler
-from zodchy_alchemy import contracts
+from zodchy_alchemy import FilterAssembler, SetMode
+from zodchy_alchemy import contracts, operators
+from zodchy_alchemy.operators import LikeMode
 
 from . import schema
 
@@ -120,3 +124,238 @@ def test_not_like_clause(assembler: FilterAssembler) -> None:
 def test_not_is_clause(assembler: FilterAssembler) -> None:
     q = str(assembler(contracts.Clause(schema.firmware.c.payload, operator.NOT(operator.IS(None))))).strip()
     assert "firmware.payload IS NOT NULL" in q
+
+
+class OVERLAP(operator.FilterBit):
+    pass
+
+
+class StrictEQ(operator.EQ):
+    pass
+
+
+def test_registered_custom_operation() -> None:
+    class ArrayFilterAssembler(FilterAssembler):
+        pass
+
+    @ArrayFilterAssembler.register(OVERLAP)
+    def _overlap(assembler, clause):
+        return clause.column.op("&&")(clause.operation.value)
+
+    q = str(
+        ArrayFilterAssembler()(
+            contracts.Clause(schema.firmware.c.version, OVERLAP(["1.0"]))
+            & contracts.Clause(schema.firmware.c.uri, operator.EQ("fw"))
+        )
+    ).strip()
+    assert "firmware.version && :version_1" in q
+    assert "firmware.uri = :uri_1" in q
+    with pytest.raises(ValueError, match="Unexpected operation"):
+        FilterAssembler()(contracts.Clause(schema.firmware.c.version, OVERLAP(["1.0"])))
+
+
+def test_operation_subclass_resolved_through_mro(assembler: FilterAssembler) -> None:
+    q = str(assembler(contracts.Clause(schema.firmware.c.version, StrictEQ("1.0")))).strip()
+    assert "firmware.version = :version_1" in q
+    assert FilterAssembler._resolved[StrictEQ] is FilterAssembler._handlers[operator.EQ]
+
+
+def test_registration_invalidates_resolved_subclasses() -> None:
+    class BaseAssembler(FilterAssembler):
+        pass
+
+    class ChildAssembler(BaseAssembler):
+        pass
+
+    assert ChildAssembler._resolve(StrictEQ) is FilterAssembler._handlers[operator.EQ]
+    BaseAssembler.register(StrictEQ, FilterAssembler._simple_clause(python_operator.ne))
+    q = str(ChildAssembler()(contracts.Clause(schema.firmware.c.version, StrictEQ("1.0")))).strip()
+    assert "firmware.version != :version_1" in q
+
+
+def test_long_chain_is_flattened(assembler: FilterAssembler) -> None:
+    leaves = [contracts.Clause(schema.firmware.c.version, operator.EQ(str(i))) for i in range(5000)]
+    left_deep: list = [leaves[0]]
+    for leaf in leaves[1:]:
+        left_deep.extend((leaf, contracts.Logic.AND))
+    right_deep = [*leaves, *[contracts.Logic.OR] * (len(leaves) - 1)]
+
+    conjunction = assembler(contracts.ClauseExpression(*left_deep))
+    disjunction = assembler(contracts.ClauseExpression(*right_deep))
+
+    assert len(conjunction.clauses) == len(leaves)
+    assert len(disjunction.clauses) == len(leaves)
+    assert all(not hasattr(clause, "clauses") for clause in conjunction.clauses)
+    assert str(conjunction).count(" AND ") == len(leaves) - 1
+
+
+def test_alternating_runs_keep_grouping(assembler: FilterAssembler) -> None:
+    a, b, c, d = (contracts.Clause(schema.firmware.c.version, operator.EQ(str(i))) for i in range(4))
+    q = str(
+        assembler(contracts.ClauseExpression(a, b, contracts.Logic.OR, c, contracts.Logic.AND, d, contracts.Logic.AND))
+    )
+    assert q == (
+        "firmware.version = :version_1 AND firmware.version = :version_2 "
+        "AND (firmware.version = :version_3 OR firmware.version = :version_4)"
+    )
+
+
+def test_array_set_mode_renders_single_parameter() -> None:
+    assembler = FilterAssembler(set_mode=SetMode.ARRAY)
+    positive = assembler(contracts.Clause(schema.firmware.c.version, operator.SET("1.0", "2.0")))
+    negative = assembler(contracts.Clause(schema.firmware.c.version, operator.NOT(operator.SET("1.0"))))
+
+    assert str(positive.compile(dialect=postgresql.dialect())) == "firmware.version = ANY (%(version_1)s::VARCHAR[])"
+    assert str(negative.compile(dialect=postgresql.dialect())) == "firmware.version != ALL (%(version_1)s::VARCHAR[])"
+    assert str(positive.compile(dialect=sqlite.dialect())) == "firmware.version IN (__[POSTCOMPILE_version_1])"
+    assert str(negative.compile(dialect=sqlite.dialect())) == "(firmware.version NOT IN (__[POSTCOMPILE_version_1]))"
+
+
+def test_array_set_mode_shares_statement_across_sizes() -> None:
+    assembler = FilterAssembler(set_mode=SetMode.ARRAY)
+    small = sqlalchemy.select(schema.firmware.c.id).where(
+        assembler(contracts.Clause(schema.firmware.c.version, operator.SET("1.0")))
+    )
+    large = sqlalchemy.select(schema.firmware.c.id).where(
+        assembler(contracts.Clause(schema.firmware.c.version, operator.SET(*(str(i) for i in range(100)))))
+    )
+    small_key = small._generate_cache_key()
+    large_key = large._generate_cache_key()
+    dialect = postgresql.dialect()
+    compiled = dialect.statement_compiler(dialect, small, cache_key=small_key)
+
+    assert small_key.key == large_key.key
+    assert "= ANY" in compiled.string
+    params = compiled.construct_params(extracted_parameters=large_key.bindparams)
+    assert sorted(params["version_1"], key=int) == [str(i) for i in range(100)]
+
+
+def test_array_set_mode_executes_on_fallback_dialect() -> None:
+    metadata = sqlalchemy.MetaData()
+    items = sqlalchemy.Table("items", metadata, sqlalchemy.Column("id", sqlalchemy.Integer, primary_key=True))
+    engine = sqlalchemy.create_engine("sqlite://")
+    metadata.create_all(engine)
+    assembler = FilterAssembler(set_mode=SetMode.ARRAY)
+    with engine.connect() as connection:
+        connection.execute(sqlalchemy.insert(items), [{"id": i} for i in range(5)])
+        included = connection.execute(
+            sqlalchemy.select(items.c.id).where(assembler(contracts.Clause(items.c.id, operator.SET(1, 3))))
+        ).scalars()
+        excluded = connection.execute(
+            sqlalchemy.select(items.c.id).where(
+                assembler(contracts.Clause(items.c.id, operator.NOT(operator.SET(1, 3))))
+            )
+        ).scalars()
+        assert sorted(included) == [1, 3]
+        assert sorted(excluded) == [0, 2, 4]
+
+
+def test_bulk_set_renders_semi_join_per_dialect() -> None:
+    assembler = FilterAssembler(set_threshold=2)
+    bulk = assembler(contracts.Clause(schema.firmware.c.version, operator.SET("1.0", "2.0", "3.0")))
+    small = assembler(contracts.Clause(schema.firmware.c.version, operator.SET("1.0", "2.0")))
+
+    assert "IN (SELECT unnest(%(version_1)s::VARCHAR[]) AS unnest_1)" in str(bulk.compile(dialect=postgresql.dialect()))
+    assert "IN (SELECT anon_1.value \nFROM json_each(?) AS anon_1)" in str(bulk.compile(dialect=sqlite.dialect()))
+    assert "firmware.version IN (__[POSTCOMPILE_version_1])" == str(small.compile(dialect=sqlite.dialect()))
+
+
+def test_bulk_set_executes_beyond_parameter_limit() -> None:
+    metadata = sqlalchemy.MetaData()
+    items = sqlalchemy.Table(
+        "items",
+        metadata,
+        sqlalchemy.Column("id", sqlalchemy.Integer, primary_key=True),
+        sqlalchemy.Column("ref", sqlalchemy.Uuid),
+    )
+    refs = [uuid.uuid4() for _ in range(10)]
+    engine = sqlalchemy.create_engine("sqlite://")
+    metadata.create_all(engine)
+    assembler = FilterAssembler(set_threshold=1000)
+    with engine.connect() as connection:
+        connection.execute(sqlalchemy.insert(items), [{"id": i, "ref": ref} for i, ref in enumerate(refs)])
+        ids = connection.execute(
+            sqlalchemy.select(items.c.id).where(
+                assembler(contracts.Clause(items.c.id, operator.SET(*range(1, 100_000, 2))))
+            )
+        ).scalars()
+        excluded = connection.execute(
+            sqlalchemy.select(items.c.id).where(
+                assembler(contracts.Clause(items.c.id, operator.NOT(operator.SET(*range(1, 100_000, 2)))))
+            )
+        ).scalars()
+        by_ref = connection.execute(
+            sqlalchemy.select(items.c.id).where(
+                assembler(contracts.Clause(items.c.ref, operator.SET(refs[3], *(uuid.uuid4() for _ in range(2000)))))
+            )
+        ).scalars()
+        assert sorted(ids) == [1, 3, 5, 7, 9]
+        assert sorted(excluded) == [0, 2, 4, 6, 8]
+        assert list(by_ref) == [3]
+
+
+@pytest.mark.parametrize(
+    "mode, pattern",
+    [
+        (LikeMode.CONTAINS, "%50\\%\\_off%"),
+        (LikeMode.PREFIX, "50\\%\\_off%"),
+        (LikeMode.SUFFIX, "%50\\%\\_off"),
+        (LikeMode.EXACT, "50\\%\\_off"),
+    ],
+)
+def test_like_modes_escape_wildcards(assembler: FilterAssembler, mode: LikeMode, pattern: str) -> None:
+    clause = assembler(
+        contracts.Clause(schema.firmware.c.uri, operators.LIKE("50%_off", case_sensitive=True, mode=mode))
+    )
+    compiled = clause.compile(dialect=sqlite.dialect())
+    assert str(compiled) == "firmware.uri LIKE ? ESCAPE '\\'"
+    assert list(compiled.params.values()) == [pattern]
+
+
+def test_like_modes_match_rows() -> None:
+    table = sqlalchemy.Table(
+        "names", sqlalchemy.MetaData(), sqlalchemy.Column("name", sqlalchemy.String, primary_key=True)
+    )
+    engine = sqlalchemy.create_engine("sqlite://")
+    table.create(engine)
+    assembler = FilterAssembler()
+    with engine.connect() as connection:
+        connection.execute(sqlalchemy.insert(table), [dict(name=n) for n in ("abc", "xabc", "a_c", "abcx")])
+
+        def names(operation):
+            query = sqlalchemy.select(table.c.name).where(assembler(contracts.Clause(table.c.name, operation)))
+            return sorted(connection.execute(query).scalars())
+
+        assert names(operators.LIKE("abc", mode=LikeMode.PREFIX)) == ["abc", "abcx"]
+        assert names(operators.LIKE("abc", mode=LikeMode.SUFFIX)) == ["abc", "xabc"]
+        assert names(operators.LIKE("ABC", mode=LikeMode.EXACT)) == ["abc"]
+        assert names(operators.LIKE("_")) == ["a_c"]
+        assert names(operator.NOT(operators.LIKE("abc", mode=LikeMode.PREFIX))) == ["a_c", "xabc"]
+
+
+def test_search_compiles_per_dialect(assembler: FilterAssembler) -> None:
+    clause = assembler(contracts.Clause(schema.firmware.c.uri, operators.SEARCH("edge router", config="english")))
+    assert str(clause.compile(dialect=postgresql.dialect())) == (
+        "to_tsvector('english'::regconfig, firmware.uri) @@ plainto_tsquery('english'::regconfig, %(uri_1)s::VARCHAR)"
+    )
+    plain = assembler(contracts.Clause(schema.firmware.c.uri, operators.SEARCH("edge")))
+    assert str(plain.compile(dialect=postgresql.dialect())) == (
+        "to_tsvector(firmware.uri) @@ plainto_tsquery(%(uri_1)s::VARCHAR)"
+    )
+    assert str(clause.compile(dialect=sqlite.dialect())) == "firmware.uri MATCH ?"
+    with pytest.raises(ValueError, match="text search configuration"):
+        assembler(contracts.Clause(schema.firmware.c.uri, operators.SEARCH("x", config="english'; --")))
+
+
+def test_search_matches_fts5_table() -> None:
+    documents = sqlalchemy.Table("documents", sqlalchemy.MetaData(), sqlalchemy.Column("body", sqlalchemy.String))
+    engine = sqlalchemy.create_engine("sqlite://")
+    with engine.connect() as connection:
+        connection.exec_driver_sql("CREATE VIRTUAL TABLE documents USING fts5(body)")
+        connection.execute(
+            sqlalchemy.insert(documents), [dict(body=b) for b in ("edge router", "core router", "edge switch")]
+        )
+        query = sqlalchemy.select(documents.c.body).where(
+            FilterAssembler()(contracts.Clause(documents.c.body, operators.SEARCH('router "edge')))
+        )
+        assert connection.execute(query).scalars().all() == ["edge router"]
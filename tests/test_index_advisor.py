@@ -0,0 +1,87 @@
+import sqlalchemy  # type: ignore[import-not-found]
+
+from zodchy.codex import operator
+
+from zodchy_alchemy import IndexAdvisor, QueryAssembler, StatementCache, contracts, operators
+
+metadata = sqlalchemy.MetaData()
+devices = sqlalchemy.Table(
+    "devices",
+    metadata,
+    sqlalchemy.Column("id", sqlalchemy.Integer, primary_key=True),
+    sqlalchemy.Column("owner_id", sqlalchemy.Integer, index=True),
+    sqlalchemy.Column("status", sqlalchemy.String),
+    sqlalchemy.Column("serial", sqlalchemy.String),
+    sqlalchemy.Column("created_at", sqlalchemy.DateTime),
+)
+
+
+def _assembler(advisor):
+    return QueryAssembler(sqlalchemy.select(devices.c.id), StatementCache(), advisor=advisor)
+
+
+def test_reports_hot_unindexed_columns():
+    advisor = IndexAdvisor()
+    assembler = _assembler(advisor)
+    for i in range(3):
+        assembler(
+            contracts.Clause(devices.c.status, operator.EQ("active")), contracts.Clause(devices.c.id, operator.EQ(i))
+        )
+    assembler(contracts.Clause(devices.c.owner_id, operator.EQ(1)))
+    report = advisor.report(min_count=2)
+    assert [(usage.column, usage.operation, usage.hits) for usage in report.unindexed] == [("status", "EQ", 3)]
+
+
+def test_flags_unanchored_like():
+    advisor = IndexAdvisor()
+    _assembler(advisor)(
+        contracts.Clause(devices.c.serial, operator.LIKE("abc")),
+        contracts.Clause(devices.c.status, operator.NOT(operator.LIKE("x"))),
+    )
+    report = advisor.report()
+    assert [(usage.column, usage.operation) for usage in report.unanchored] == [
+        ("serial", "LIKE"),
+        ("status", "NOT LIKE"),
+    ]
+    assert report.unindexed == []
+
+    advisor.record([contracts.Clause(devices.c.serial, operators.LIKE("abc", mode=operators.LikeMode.PREFIX))])
+    assert [(usage.column, usage.operation) for usage in advisor.report().unindexed] == [("serial", "LIKE")]
+
+
+def test_suggests_composite_indexes_for_filter_and_order():
+    advisor = IndexAdvisor()
+    assembler = _assembler(advisor)
+    for _ in range(2):
+        assembler(
+            contracts.Clause(devices.c.status, operator.EQ("active")),
+            contracts.Clause(devices.c.owner_id, operator.EQ(1)),
+            contracts.Clause(devices.c.created_at, operator.DESC()),
+            operator.Limit(10),
+        )
+    assembler(
+        contracts.ClauseExpression(contracts.Clause(devices.c.status, operator.EQ("a")))
+        | contracts.Clause(devices.c.serial, operator.EQ("b")),
+        contracts.Clause(devices.c.created_at, operator.GE(0)),
+    )
+    suggestions = advisor.report().composites
+    assert [(s.columns, s.hits) for s in suggestions] == [(("owner_id", "status", "created_at"), 2)]
+
+    index = suggestions[0].to_index(devices)
+    assert [column.name for column in index.columns] == ["owner_id", "status", "created_at"]
+    assert not advisor.report().composites
+
+
+def test_skips_composites_covered_by_existing_indexes():
+    advisor = IndexAdvisor()
+    advisor.record(
+        [
+            contracts.Clause(devices.c.id, operator.EQ(1)),
+            contracts.Clause(devices.c.created_at, operator.RANGE(operator.GE(0), operator.LT(1))),
+        ]
+    )
+    assert advisor.report().composites[0].columns == ("id", "created_at")
+    sqlalchemy.Index("ix_devices_id_created_at", devices.c.id, devices.c.created_at)
+    assert advisor.report().composites == []
+    advisor.clear()
+    assert advisor.report() == ([], [], [])
@@ -0,0 +1,82 @@
+import pytest
+import sqlalchemy  # type: ignore[import-not-found]
+from sqlalchemy.ext.asyncio import create_async_engine  # type: ignore[import-not-found]
+
+from zodchy.codex import operator
+
+from zodchy_alchemy import Executor, HistogramCollector, QueryAssembler, StatementCache, contracts
+from zodchy_alchemy.adapters.cqea import QueryAdapter
+
+from . import schema
+
+
+class Exporter:
+    def __init__(self):
+        self.exported = []
+
+    def export(self, histograms):
+        self.exported.append(histograms)
+
+
+def test_collector_builds_histograms():
+    collector = HistogramCollector()
+    for value in (1, 2, 3, 100):
+        collector.record("metric", value)
+    histogram = collector.snapshot()["metric"]
+    assert (histogram.samples, histogram.total, histogram.minimum, histogram.maximum) == (4, 106, 1, 100)
+    assert histogram.mean == 26.5
+    assert histogram.quantile(0.5) == 2
+    assert histogram.quantile(1) == 100
+    with pytest.raises(ValueError, match="Expected a quantile"):
+        histogram.quantile(2)
+
+
+def test_collector_exports_and_resets():
+    collector = HistogramCollector()
+    collector.record("metric", 1)
+    exporter = Exporter()
+    collector.export(exporter, reset=True)
+    assert list(exporter.exported[0]) == ["metric"]
+    assert collector.snapshot() == {}
+
+
+def test_query_assembler_records_phases(base_query):
+    collector = HistogramCollector()
+    assembler = QueryAssembler(base_query, StatementCache(), observer=collector)
+    for _ in range(2):
+        assembler(
+            contracts.Clause(schema.hardware.c.revision, operator.EQ("01"), schema.hardware_firmware),
+            contracts.Clause(schema.firmware.c.version, operator.NOT(operator.SET("1.0", "2.0", "3.0"))),
+            contracts.Clause(schema.firmware.c.id, operator.ASC()),
+            operator.Limit(10),
+        )
+    metrics = collector.snapshot()
+    for phase in ("separate", "join", "filter", "order", "slice"):
+        assert metrics[f"query.{phase}.seconds"].samples == 1
+    assert metrics["query.joins"].total == 2
+    assert metrics["query.clauses"].maximum == 3
+    assert metrics["query.set_size"].maximum == 3
+    assert metrics["query.statement_cache.hit"].mean == 0.5
+
+
+def test_query_adapter_records_adaptation():
+    collector = HistogramCollector()
+    adapter = QueryAdapter(default_table=schema.firmware, observer=collector)
+
+    class Query:
+        def __iter__(self):
+            yield "version", operator.EQ("1.0")
+
+    assert len(list(adapter(Query()))) == 1
+    assert collector.snapshot()["adapter.elements"].total == 1
+
+
+async def test_executor_records_compiled_cache_hits():
+    collector = HistogramCollector()
+    executor = Executor(create_async_engine("sqlite+aiosqlite://"), observer=collector)
+    for _ in range(3):
+        await executor.execute(sqlalchemy.select(sqlalchemy.literal(1)))
+    metrics = collector.snapshot()
+    assert metrics["executor.read.seconds"].samples == 3
+    assert metrics["executor.compiled_cache.hit"].total == 2
+    await executor.dispose()
@@ -1,8 +1,9 @@
 import pytest
+import sqlalchemy  # type: ignore[import-not-found]
 
 from zodchy.codex import operator
 
-from zodchy_alchemy import JoinsAssembler
+from zodchy_alchemy import FilterAssembler, JoinGraph, JoinsAssembler
 from zodchy_alchemy import contracts
 
 from . import schema
@@ -47,3 +48,99 @@ def test_join_through_condition(assembler):
     assert q.count("JOIN") == 2
     assert "LEFT OUTER JOIN hardware_firmware ON hardware_firmware.firmware_id = firmware.id" in q
     assert "LEFT OUTER JOIN hardware ON hardware.id = hardware_firmware.hardware_id" in q
+
+
+@pytest.fixture(scope="module")
+def graph():
+    return JoinGraph(schema.db_metadata)
+
+
+def test_graph_joins_two_hops(graph):
+    query = sqlalchemy.select(schema.device.c.id)
+    q = str(
+        JoinsAssembler(query, graph)(
+            contracts.ClauseExpression(contracts.Clause(schema.hardware_platform.c.code, operator.EQ("x86")))
+        )
+    )
+    assert "LEFT OUTER JOIN hardware ON hardware.id = devices.hardware_id" in q
+    assert "LEFT OUTER JOIN hardware_platforms ON hardware_platforms.id = hardware.platform_id" in q
+
+
+def test_graph_joins_through_child_table(graph, base_query):
+    q = str(
+        JoinsAssembler(base_query, graph)(
+            contracts.ClauseExpression(contracts.Clause(schema.hardware.c.revision, operator.EQ("01")))
+        )
+    )
+    assert q.count("JOIN") == 2
+    assert "LEFT OUTER JOIN hardware_firmware ON firmware.id = hardware_firmware.firmware_id" in q
+    assert "LEFT OUTER JOIN hardware ON hardware.id = hardware_firmware.hardware_id" in q
+
+
+def test_graph_prefers_explicit_conditions(graph, base_query):
+    q = str(
+        JoinsAssembler(base_query, graph)(
+            contracts.ClauseExpression(
+                contracts.Clause(
+                    schema.hardware.c.revision,
+                    operator.EQ("01"),
+                    schema.hardware_firmware.c.firmware_id == schema.firmware.c.id,
+                )
+            )
+        )
+    )
+    assert q.count("JOIN") == 2
+    assert "LEFT OUTER JOIN hardware_firmware ON hardware_firmware.firmware_id = firmware.id" in q
+
+
+def test_graph_caches_paths(graph):
+    path = graph.path({"devices"}, "hardware_platforms")
+    assert [table.name for table, _ in path] == ["hardware", "hardware_platforms"]
+    assert graph.path(["devices"], "hardware_platforms") is path
+    assert graph.path({"devices"}, "devices") is None
+    assert graph.path({"devices"}, "unknown") is None
+
+
+def test_semi_join_groups_child_filters_into_exists(base_query):
+    query, remaining = JoinsAssembler(base_query).semi_join(
+        [
+            contracts.Clause(schema.hardware_firmware.c.hardware_id, operator.NE(None)),
+            contracts.Clause(schema.hardware_firmware.c.id, operator.EQ(1)),
+        ],
+        FilterAssembler(),
+    )
+    q = str(query)
+    assert remaining == []
+    assert "JOIN" not in q
+    assert q.count("EXISTS") == 1
+    assert (
+        "WHERE EXISTS (SELECT 1 \nFROM hardware_firmware \n"
+        "WHERE firmware.id = hardware_firmware.firmware_id "
+        "AND hardware_firmware.hardware_id IS NOT NULL AND hardware_firmware.id = :id_1)"
+    ) in q
+
+
+def test_semi_join_through_link_table(graph, base_query):
+    query, remaining = JoinsAssembler(base_query, graph).semi_join(
+        [contracts.Clause(schema.hardware.c.revision, operator.EQ("01"))], FilterAssembler()
+    )
+    q = str(query)
+    assert remaining == [] and "JOIN" not in q
+    assert "FROM hardware_firmware, hardware" in q
+    assert "firmware.id = hardware_firmware.firmware_id AND hardware.id = hardware_firmware.hardware_id" in q
+
+
+def test_semi_join_keeps_null_filters_on_outer_join(base_query):
+    missing = contracts.Clause(schema.hardware_firmware.c.hardware_id, operator.IS(None))
+    query, remaining = JoinsAssembler(base_query).semi_join(
+        [missing, contracts.Clause(schema.hardware_firmware.c.id, operator.EQ(1))], FilterAssembler()
+    )
+    assert remaining == [missing]
+    assert "hardware_firmware.hardware_id" not in str(query)
+
+
+def test_semi_join_keeps_to_one_filters(base_query):
+    clause = contracts.Clause(schema.tag.c.name, operator.EQ("common"))
+    query, remaining = JoinsAssembler(base_query).semi_join([clause], FilterAssembler())
+    assert remaining == [clause]
+    assert query is base_query
@@ -0,0 +1,127 @@
+import asyncio
+
+import pytest
+import sqlalchemy  # type: ignore[import-not-found]
+from sqlalchemy.ext.asyncio import create_async_engine  # type: ignore[import-not-found]
+
+from zodchy_alchemy import Executor, Loader
+
+metadata = sqlalchemy.MetaData()
+devices = sqlalchemy.Table(
+    "devices",
+    metadata,
+    sqlalchemy.Column("id", sqlalchemy.Integer, primary_key=True),
+    sqlalchemy.Column("owner", sqlalchemy.Integer),
+)
+
+
+@pytest.fixture
+async def executor(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'devices.db'}")
+    async with engine.begin() as connection:
+        await connection.run_sync(metadata.create_all)
+        await connection.execute(sqlalchemy.insert(devices), [dict(id=i, owner=i % 3) for i in range(10)])
+    executor = Executor(engine)
+    yield executor
+    await executor.dispose()
+
+
+@pytest.fixture
+def statements(executor):
+    executed = []
+
+    async def execute(statement):
+        executed.append(statement)
+        return await executor.execute(statement)
+
+    return execute, executed
+
+
+async def test_coalesces_lookups_in_one_tick(statements):
+    execute, executed = statements
+    loader = Loader(execute, sqlalchemy.select(devices.c.id, devices.c.owner), devices.c.id)
+    first, second, missing, again = await asyncio.gather(
+        loader.load(1), loader.load(2), loader.load(42), loader.load(1)
+    )
+    assert [tuple(row) for row in first] == [(1, 1)]
+    assert [tuple(row) for row in second] == [(2, 2)]
+    assert missing == [] and again is first
+    assert len(executed) == 1 and " IN " in str(executed[0])
+
+
+async def test_splits_non_unique_keys(statements):
+    execute, executed = statements
+    loader = Loader(execute, sqlalchemy.select(devices.c.id, devices.c.owner), devices.c.owner)
+    groups = await loader.load_many([0, 1])
+    assert [[row.id for row in rows] for rows in groups] == [[0, 3, 6, 9], [1, 4, 7]]
+    assert len(executed) == 1
+
+
+async def test_caches_until_cleared(statements):
+    execute, executed = statements
+    loader = Loader(execute, sqlalchemy.select(devices.c.id), devices.c.id, cache=True)
+    await loader.load(1)
+    await loader.load(1)
+    assert len(executed) == 1
+    loader.clear(1)
+    await loader.load(1)
+    assert len(executed) == 2
+
+    uncached = Loader(execute, sqlalchemy.select(devices.c.id), devices.c.id)
+    await uncached.load(1)
+    await uncached.load(1)
+    assert len(executed) == 4
+
+
+async def test_bounds_cached_keys(statements):
+    execute, executed = statements
+    loader = Loader(execute, sqlalchemy.select(devices.c.id), devices.c.id, cache=True, maxsize=2)
+    await loader.load_many([1, 2])
+    await loader.load(1)
+    await loader.load(3)
+    assert len(executed) == 2
+    await loader.load(1)
+    assert len(executed) == 2
+    await loader.load(2)
+    assert len(executed) == 3
+
+
+async def test_splits_batches_by_size_and_window(statements):
+    execute, executed = statements
+    loader = Loader(execute, sqlalchemy.select(devices.c.id), devices.c.id, max_batch_size=4)
+    assert len(await loader.load_many(range(10))) == 10
+    assert loader.batches == 3
+
+    windowed = Loader(execute, sqlalchemy.select(devices.c.id), devices.c.id, window=0.02)
+
+    async def late(key):
+        await asyncio.sleep(0.005)
+        return await windowed.load(key)
+
+    await asyncio.gather(windowed.load(0), late(1), late(2))
+    assert windowed.batches == 1
+
+
+async def test_propagates_errors_and_forgets_failed_keys():
+    calls = []
+
+    async def execute(statement):
+        calls.append(statement)
+        raise RuntimeError("boom")
+
+    loader = Loader(execute, sqlalchemy.select(devices.c.id), devices.c.id)
+    with pytest.raises(RuntimeError, match="boom"):
+        await loader.load(1)
+    with pytest.raises(RuntimeError, match="boom"):
+        await loader.load(1)
+    assert len(calls) == 2
+
+
+def test_rejects_non_positive_cache_size():
+    with pytest.raises(ValueError, match="Expected a positive cache size"):
+        Loader(None, sqlalchemy.select(devices.c.id), devices.c.id, maxsize=0)
+
+
+def test_rejects_unselected_key_column():
+    with pytest.raises(ValueError, match="among the selected columns"):
+        Loader(None, sqlalchemy.select(devices.c.id), devices.c.owner)
@@ -1,4 +1,9 @@
+import uuid
+
 import pytest
+import sqlalchemy  # type: ignore[import-not-found]
+from sqlalchemy.dialects import mysql, postgresql, sqlite  # type: ignore[import-not-found]
+from sqlalchemy.ext.asyncio import create_async_engine  # type: ignore[import-not-found]
 
 from zodchy.codex import operator
 
@@ -74,3 +79,154 @@ def test_rejects_non_filter_clause(assembler: MutationAssembler) -> None:
 def test_update_requires_filters(assembler: MutationAssembler) -> None:
     with pytest.raises(ValueError, match="Expected at least one filter"):
         assembler._update([dict(name="test")], [])
+
+
+@pytest.fixture
+async def connection():
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as connection:
+        await connection.run_sync(schema.hardware.create)
+        yield connection
+    await engine.dispose()
+
+
+def _rows(count):
+    return (
+        dict(id=uuid.UUID(int=i), name=f"hw{i}", revision="1.0", platform_id=uuid.UUID(int=0)) for i in range(count)
+    )
+
+
+async def _count(connection):
+    return (await connection.execute(sqlalchemy.select(sqlalchemy.func.count()).select_from(schema.hardware))).scalar()
+
+
+async def test_bulk_insert_in_chunks(assembler, connection):
+    reported = []
+    progress = await assembler.bulk_insert(connection, _rows(25), chunk_size=10, on_progress=reported.append)
+    assert [(p.rows, p.chunks) for p in reported] == [(10, 1), (20, 2), (25, 3)]
+    assert progress == reported[-1] and progress.throughput > 0
+    assert await _count(connection) == 25
+
+
+async def test_bulk_insert_from_async_iterable(assembler, connection):
+    async def rows():
+        for row in _rows(5):
+            yield row
+
+    progress = await assembler.bulk_insert(connection, rows(), chunk_size=2)
+    assert (progress.rows, progress.chunks) == (5, 3)
+    assert await _count(connection) == 5
+
+
+async def test_bulk_insert_of_nothing(assembler, connection):
+    assert (await assembler.bulk_insert(connection, [])).rows == 0
+
+
+async def test_bulk_insert_rejects_non_positive_chunk(assembler, connection):
+    with pytest.raises(ValueError, match="Expected a positive chunk size"):
+        await assembler.bulk_insert(connection, _rows(1), chunk_size=0)
+
+
+async def _names(connection):
+    query = sqlalchemy.select(schema.hardware.c.name).order_by(schema.hardware.c.id)
+    return (await connection.execute(query)).scalars().all()
+
+
+async def test_bulk_update_by_key(assembler, connection):
+    await assembler.bulk_insert(connection, _rows(5))
+    rows = [dict(id=uuid.UUID(int=i), name=f"updated{i}") for i in (1, 3)]
+    progress = await assembler.bulk_update(connection, rows, schema.hardware.c.id)
+    assert progress.rows == 2
+    assert await _names(connection) == ["hw0", "updated1", "hw2", "updated3", "hw4"]
+
+
+async def test_bulk_update_with_guard(assembler, connection):
+    await assembler.bulk_insert(connection, _rows(3))
+    rows = [dict(id=uuid.UUID(int=i), name=f"updated{i}") for i in range(3)]
+    await assembler.bulk_update(
+        connection, rows, "id", contracts.Clause(schema.hardware.c.name, operator.NE("hw1")), chunk_size=2
+    )
+    assert await _names(connection) == ["updated0", "hw1", "updated2"]
+
+
+async def test_bulk_update_with_set_guards(assembler, connection):
+    await assembler.bulk_insert(connection, _rows(4))
+    rows = [dict(id=uuid.UUID(int=i), name=f"updated{i}") for i in range(4)]
+    await assembler.bulk_update(
+        connection,
+        rows,
+        "id",
+        contracts.Clause(schema.hardware.c.name, operator.SET("hw0", "hw1", "hw2")),
+        contracts.Clause(schema.hardware.c.id, operator.NOT(operator.SET(uuid.UUID(int=1)))),
+        chunk_size=3,
+    )
+    assert await _names(connection) == ["updated0", "hw1", "updated2", "hw3"]
+
+
+def test_bulk_update_renders_values_join_on_postgresql(assembler):
+    rows = [dict(id=uuid.UUID(int=i), name=f"updated{i}") for i in range(2)]
+    key = schema.hardware.c.id
+    guard = assembler._guard([contracts.Clause(schema.hardware.c.revision, operator.EQ("1.0"))])
+    q = str(assembler._values_update(rows, ("id", "name"), key, guard).compile(dialect=postgresql.dialect()))
+    assert q.startswith("UPDATE hardware SET name=bulk.name FROM (VALUES (CAST(")
+    assert "AS bulk (id, name) WHERE hardware.id = bulk.id AND hardware.revision = " in q
+
+
+async def test_bulk_update_requires_key_in_rows(assembler, connection):
+    with pytest.raises(ValueError, match="Expected key column id"):
+        await assembler.bulk_update(connection, [dict(name="test")], "id")
+
+
+async def test_bulk_update_requires_columns_besides_key(assembler, connection):
+    with pytest.raises(ValueError, match="Expected columns to update besides id"):
+        await assembler.bulk_update(connection, [{"id": uuid.UUID(int=0)}], "id")
+
+
+async def test_bulk_update_requires_uniform_rows(assembler, connection):
+    rows = [dict(id=uuid.UUID(int=0), name="a"), dict(id=uuid.UUID(int=1), revision="2.0")]
+    with pytest.raises(ValueError, match="Expected rows with the same columns"):
+        await assembler.bulk_update(connection, rows, "id")
+
+
+async def test_bulk_upsert_inserts_and_updates(assembler, connection):
+    await assembler.bulk_insert(connection, _rows(2))
+    rows = [dict(id=uuid.UUID(int=i), name=f"synced{i}", revision="2.0", platform_id=uuid.UUID(int=0)) for i in (1, 2)]
+    returned = []
+    progress = await assembler.bulk_upsert(
+        connection,
+        rows,
+        update=["name"],
+        returning=[schema.hardware.c.name, schema.hardware.c.revision],
+        on_returning=returned.extend,
+        chunk_size=1,
+    )
+    assert progress.chunks == 2
+    assert [tuple(row) for row in returned] == [("synced1", "1.0"), ("synced2", "2.0")]
+    assert await _names(connection) == ["hw0", "synced1", "synced2"]
+
+
+async def test_bulk_upsert_without_update_columns_skips_conflicts(assembler, connection):
+    await assembler.bulk_insert(connection, _rows(1))
+    rows = [dict(id=uuid.UUID(int=i), name="new", revision="2.0", platform_id=uuid.UUID(int=0)) for i in (0, 1)]
+    await assembler.bulk_upsert(connection, rows, conflict=[schema.hardware.c.id], update=[])
+    assert await _names(connection) == ["hw0", "new"]
+
+
+@pytest.mark.parametrize(
+    "dialect, expected",
+    [
+        ("postgresql", "ON CONFLICT (id) DO UPDATE SET name = excluded.name, revision = excluded.revision"),
+        ("sqlite", "ON CONFLICT (id) DO UPDATE SET name = excluded.name, revision = excluded.revision"),
+        ("mysql", "ON DUPLICATE KEY UPDATE name = VALUES(name), revision = VALUES(revision)"),
+    ],
+)
+def test_upsert_statement_per_dialect(assembler, dialect, expected):
+    key = schema.hardware.c.id
+    statement = assembler._upsert(dialect, ("id", "name", "revision"), (key,), None, ())
+    dialects = {"postgresql": postgresql.dialect(), "sqlite": sqlite.dialect(), "mysql": mysql.dialect()}
+    assert expected in str(statement.compile(dialect=dialects[dialect]))
+
+
+def test_upsert_rejects_unsupported_dialect(assembler):
+    with pytest.raises(ValueError, match="Upsert is not supported on mssql"):
+        assembler._upsert("mssql", ("id",), (schema.hardware.c.id,), None, ())
@@ -4,7 +4,9 @@ import pytest
 from zodchy.codex import operator
 
 import sqlalchemy  # type: ignore[import-not-found]
-from zodchy_alchemy import QueryAssembler  # type: ignore[import-not-found]
+from sqlalchemy.dialects import postgresql  # type: ignore[import-not-found]
+from zodchy_alchemy import operators  # type: ignore[import-not-found]
+from zodchy_alchemy import CacheInfo, CountStrategy, FilterAssembler, JoinGraph, QueryAssembler, SetMode, StatementCache  # type: ignore[import-not-found]
 from zodchy_alchemy import contracts
 
 from . import schema
@@ -62,3 +64,228 @@ def test_invalid_clause_kind_raises(assembler):
     bad_clause = contracts.Clause(schema.firmware.c.id, operator.ClauseBit())
     with pytest.raises(ValueError, match="Expected a filter, order or slice clause"):
         assembler(bad_clause)
+
+
+def test_assembler_is_reusable(assembler):
+    assembler(contracts.Clause(schema.firmware.c.version, operator.EQ("1.0")))
+    q = str(assembler(contracts.Clause(schema.firmware.c.uri, operator.EQ("fw")))).strip()
+    assert "firmware.version =" not in q
+    assert "WHERE firmware.uri = :uri_1" in q
+
+
+def _compile(query: sqlalchemy.Select) -> str:
+    return str(query.compile(compile_kwargs={"literal_binds": True}))
+
+
+def test_cached_shape_binds_values(base_query):
+    cache = StatementCache(maxsize=8)
+    assembler = QueryAssembler(base_query, cache=cache)
+
+    def build(version: str, uris: tuple[str, ...], limit: int) -> sqlalchemy.Select:
+        return assembler(
+            contracts.Clause(schema.hardware.c.revision, operator.EQ(version), schema.hardware_firmware),
+            contracts.Clause(schema.firmware.c.uri, operator.SET(*uris))
+            | contracts.Clause(schema.firmware.c.uri, operator.LIKE("edge")),
+            contracts.Clause(schema.firmware.c.version, operator.RANGE(operator.GE("1.0"), None)),
+            contracts.Clause(schema.firmware.c.version, operator.DESC()),
+            operator.Limit(limit),
+        )
+
+    first = build("01", ("a", "z"), 10)
+    second = build("02", ("b",), 20)
+    assert cache.info() == CacheInfo(hits=1, misses=1, maxsize=8, currsize=1)
+
+    uncached = QueryAssembler(base_query)(
+        contracts.Clause(schema.hardware.c.revision, operator.EQ("02"), schema.hardware_firmware),
+        contracts.Clause(schema.firmware.c.uri, operator.SET("b"))
+        | contracts.Clause(schema.firmware.c.uri, operator.LIKE("edge")),
+        contracts.Clause(schema.firmware.c.version, operator.RANGE(operator.GE("1.0"), None)),
+        contracts.Clause(schema.firmware.c.version, operator.DESC()),
+        operator.Limit(20),
+    )
+    assert _compile(second) == _compile(uncached)
+    assert "hardware.revision = '01'" in _compile(first)
+    assert "LIMIT 10" in _compile(first)
+    assert first._generate_cache_key().key == second._generate_cache_key().key
+
+
+def test_cache_keys_on_shape(base_query):
+    cache = StatementCache()
+    assembler = QueryAssembler(base_query, cache=cache)
+    assembler(contracts.Clause(schema.firmware.c.version, operator.EQ("1.0")))
+    assembler(contracts.Clause(schema.firmware.c.version, operator.NE("1.0")))
+    assembler(contracts.Clause(schema.firmware.c.uri, operator.EQ("1.0")))
+    assembler(contracts.Clause(schema.firmware.c.uri, operator.EQ("1.0")), operator.Offset(5))
+    q = _compile(assembler(contracts.Clause(schema.firmware.c.uri, operator.EQ(None))))
+    assert "firmware.uri IS NULL" in q
+    assert cache.info().misses == 5
+    assert cache.info().hits == 0
+
+
+def test_cache_keys_inline_join_conditions_by_structure(base_query):
+    cache = StatementCache()
+    assembler = QueryAssembler(base_query, cache=cache)
+    for revision in ("01", "02"):
+        statement = assembler(
+            contracts.Clause(
+                schema.hardware.c.revision,
+                operator.EQ(revision),
+                schema.hardware_firmware.c.firmware_id == schema.firmware.c.id,
+                schema.hardware.c.id == schema.hardware_firmware.c.hardware_id,
+            )
+        )
+    assert cache.info()[:2] == (1, 1)
+    assert "hardware.revision = '02'" in _compile(statement)
+
+    assembler(
+        contracts.Clause(
+            schema.hardware.c.revision,
+            operator.EQ("01"),
+            schema.hardware_firmware.c.firmware_id == schema.firmware.c.id,
+            schema.hardware.c.id == schema.hardware_firmware.c.firmware_id,
+        )
+    )
+    assert cache.info()[:2] == (1, 2)
+
+
+def test_cache_binds_like_modes_and_search(base_query):
+    cache = StatementCache()
+    assembler = QueryAssembler(base_query, cache=cache)
+    for value in ("fw_1", "fw_2"):
+        prefix = assembler(
+            contracts.Clause(schema.firmware.c.uri, operators.LIKE(value, mode=operators.LikeMode.PREFIX))
+        )
+        assembler(contracts.Clause(schema.firmware.c.uri, operators.SEARCH(value)))
+    assembler(contracts.Clause(schema.firmware.c.uri, operators.LIKE("fw", mode=operators.LikeMode.SUFFIX)))
+    assert cache.info()[:2] == (2, 3)
+    assert prefix.compile().params["tpl_0"] == "fw\\_2%"
+
+
+def test_cache_evicts_least_recently_used(base_query):
+    cache = StatementCache(maxsize=2)
+    assembler = QueryAssembler(base_query, cache=cache)
+    assembler(contracts.Clause(schema.firmware.c.version, operator.EQ("1.0")))
+    assembler(contracts.Clause(schema.firmware.c.uri, operator.EQ("fw")))
+    assembler(contracts.Clause(schema.firmware.c.version, operator.EQ("2.0")))
+    assembler(contracts.Clause(schema.firmware.c.id, operator.DESC()))
+    assert len(cache) == 2
+    assembler(contracts.Clause(schema.firmware.c.version, operator.EQ("3.0")))
+    assembler(contracts.Clause(schema.firmware.c.uri, operator.EQ("fw")))
+    assert cache.info() == CacheInfo(hits=2, misses=4, maxsize=2, currsize=2)
+
+
+def test_cache_rejects_invalid_size():
+    with pytest.raises(ValueError, match="Expected a positive cache size"):
+        StatementCache(maxsize=0)
+
+
+def test_cache_bypassed_for_invalid_clause(base_query):
+    cache = StatementCache()
+    assembler = QueryAssembler(base_query, cache=cache)
+    with pytest.raises(ValueError, match="Expected a filter, order or slice clause"):
+        assembler(contracts.Clause(schema.firmware.c.id, operator.ClauseBit()))
+    assert len(cache) == 0
+
+
+def test_cache_distinguishes_filter_assemblers(base_query):
+    cache = StatementCache()
+    clause = contracts.Clause(schema.firmware.c.version, operator.SET("1.0", "2.0"))
+    listed = QueryAssembler(base_query, cache=cache)(clause)
+    arrayed = QueryAssembler(base_query, cache=cache, filter_assembler=FilterAssembler(set_mode=SetMode.ARRAY))(clause)
+    QueryAssembler(base_query, cache=cache, filter_assembler=FilterAssembler(set_mode=SetMode.ARRAY))(clause)
+
+    assert "IN (__[POSTCOMPILE_tpl_0])" in str(listed.compile(dialect=postgresql.dialect()))
+    assert "= ANY (%(tpl_0)s::VARCHAR[])" in str(arrayed.compile(dialect=postgresql.dialect()))
+    assert cache.info().hits == 1
+
+
+def test_cache_separates_bulk_sets(base_query):
+    cache = StatementCache()
+    assembler = QueryAssembler(base_query, cache=cache, filter_assembler=FilterAssembler(set_threshold=2))
+    small = assembler(contracts.Clause(schema.firmware.c.version, operator.SET("1.0")))
+    bulk = assembler(contracts.Clause(schema.firmware.c.version, operator.SET("1.0", "2.0", "3.0")))
+
+    assert "= ANY" not in str(small.compile(dialect=postgresql.dialect()))
+    assert "unnest(%(tpl_0)s::VARCHAR[])" in str(bulk.compile(dialect=postgresql.dialect()))
+    assert sorted(bulk.compile().params["tpl_0"]) == ["1.0", "2.0", "3.0"]
+    assert cache.info().misses == 2
+
+
+def test_join_graph(base_query):
+    assembler = QueryAssembler(base_query, join_graph=JoinGraph(schema.db_metadata))
+    q = str(assembler(contracts.Clause(schema.hardware.c.revision, operator.EQ("01"))))
+    assert "LEFT OUTER JOIN hardware ON hardware.id = hardware_firmware.hardware_id" in q
+    assert "WHERE hardware.revision = :revision_1" in q
+
+
+def test_semi_joins(base_query):
+    assembler = QueryAssembler(base_query, semi_joins=True)
+    q = str(
+        assembler(
+            contracts.Clause(schema.hardware.c.revision, operator.EQ("01"), schema.hardware_firmware),
+            contracts.Clause(schema.tag.c.name, operator.EQ("common")),
+            operator.Limit(10),
+        )
+    )
+    assert "LEFT OUTER JOIN tags ON tags.id = firmware.tag_id" in q
+    assert "hardware_firmware" not in q.split("WHERE")[0]
+    assert "WHERE (EXISTS (SELECT 1 \nFROM hardware_firmware, hardware" in q
+    assert "hardware.revision = :revision_1)) AND tags.name = :name_1" in q
+
+
+def test_semi_joins_keep_null_filters_on_outer_join(base_query):
+    assembler = QueryAssembler(base_query, semi_joins=True)
+    q = str(
+        assembler(contracts.Clause(schema.hardware_firmware.c.hardware_id, operator.IS(None), schema.hardware_firmware))
+    )
+    assert "EXISTS" not in q
+    assert "LEFT OUTER JOIN hardware_firmware ON firmware.id = hardware_firmware.firmware_id" in q
+    assert "WHERE hardware_firmware.hardware_id IS NULL" in q
+
+
+def test_paginate_with_window_count(assembler):
+    pagination = assembler.paginate(
+        contracts.Clause(schema.firmware.c.version, operator.EQ("1.0")),
+        contracts.Clause(schema.firmware.c.id, operator.ASC()),
+        operator.Limit(10),
+    )
+    q = str(pagination.query)
+    assert "count(*) OVER () AS total_count" in q
+    assert "ORDER BY firmware.id ASC" in q and "LIMIT :param_1" in q
+    assert str(pagination.count_query) == (
+        "SELECT count(*) AS count_1 \nFROM firmware \nWHERE firmware.version = :version_1"
+    )
+
+
+def test_count_query_drops_to_one_joins_not_filtered_on():
+    base = sqlalchemy.select(schema.device.c.id, schema.hardware.c.name).join(
+        schema.hardware, schema.hardware.c.id == schema.device.c.hardware_id, isouter=True
+    )
+    assembler = QueryAssembler(base, join_graph=JoinGraph(schema.db_metadata))
+    pagination = assembler.paginate(
+        contracts.Clause(schema.device.c.name, operator.EQ("edge")), strategy=CountStrategy.SEPARATE
+    )
+    assert "total_count" not in str(pagination.query)
+    assert str(pagination.count_query) == "SELECT count(*) AS count_1 \nFROM devices \nWHERE devices.name = :name_1"
+
+    pagination = assembler.paginate(contracts.Clause(schema.hardware_platform.c.code, operator.EQ("x86")))
+    assert "LEFT OUTER JOIN hardware ON hardware.id = devices.hardware_id" in str(pagination.count_query)
+    assert "LEFT OUTER JOIN hardware_platforms" in str(pagination.count_query)
+
+
+def test_count_query_wraps_explicit_select_from():
+    base = sqlalchemy.select(schema.device.c.id).select_from(schema.device.join(schema.hardware))
+    pagination = QueryAssembler(base).paginate(
+        contracts.Clause(schema.device.c.name, operator.EQ("edge")), strategy=CountStrategy.SEPARATE
+    )
+    assert str(pagination.count_query) == (
+        "SELECT count(*) AS count_1 \nFROM (SELECT devices.id AS id \n"
+        "FROM devices JOIN hardware ON hardware.id = devices.hardware_id \n"
+        "WHERE devices.name = :name_1) AS anon_1"
+    )
+
+
+def test_count_query_wraps_grouped_queries():
+    base = sqlalchemy.select(schema.firmware.c.version).group_by(schema.firmware.c.version)
+    pagination = QueryAssembler(base).paginate(operator.Limit(5))
+    assert str(pagination.count_query).startswith("SELECT count(*) AS count_1 \nFROM (SELECT firmware.version")
@@ -0,0 +1,67 @@
+import decimal
+
+import pytest
+import sqlalchemy  # type: ignore[import-not-found]
+
+from zodchy_alchemy.serializers import row
+
+
+class Money(decimal.Decimal):
+    pass
+
+
+@row.field_serializer.register
+def _(value: Money) -> str:
+    return f"{value:.2f}"
+
+
+metadata = sqlalchemy.MetaData()
+items = sqlalchemy.Table(
+    "items",
+    metadata,
+    sqlalchemy.Column("id", sqlalchemy.Integer, primary_key=True),
+    sqlalchemy.Column("price", sqlalchemy.Numeric(asdecimal=True)),
+)
+
+
+@pytest.fixture
+def connection():
+    engine = sqlalchemy.create_engine("sqlite://")
+    metadata.create_all(engine)
+    with engine.connect() as connection:
+        yield connection
+
+
+def _select(connection, *rows):
+    connection.execute(sqlalchemy.insert(items), [dict(id=id_, price=price) for id_, price in rows])
+    return connection.execute(sqlalchemy.select(items.c.id, items.c.price).order_by(items.c.id))
+
+
+def test_serializer_matches_to_dict(connection):
+    result = _select(connection, (1, None), (2, decimal.Decimal("3.5")))
+    serializer = row.row_serializer(result)
+    rows = result.all()
+    assert [serializer(r) for r in rows] == [row.to_dict(r) for r in rows]
+
+
+def test_serializer_skips_identity_columns():
+    serializer = row.RowSerializer(["id", "price"])
+    assert serializer((1, Money("2"))) == {"id": 1, "price": "2.00"}
+    assert [index for index, _, _ in serializer._converters] == [1]
+    assert not serializer._pending
+
+
+def test_serializer_resolves_columns_first_seen_as_null():
+    serializer = row.RowSerializer(["id", "price"])
+    assert serializer((1, None)) == {"id": 1, "price": None}
+    assert serializer._pending == (1,)
+    assert serializer((2, Money("1.5"))) == {"id": 2, "price": "1.50"}
+    assert serializer._pending == ()
+
+
+def test_serializer_falls_back_to_dispatch_for_columns_always_null():
+    serializer = row.RowSerializer(["id", "price"])
+    for id_ in range(row._RESOLVE_ROWS + 1):
+        assert serializer((id_, None)) == {"id": id_, "price": None}
+    assert serializer._pending == ()
+    assert serializer((0, Money("1"))) == {"id": 0, "price": "1.00"}
@@ -1,8 +1,18 @@
+import enum
+import types
+import uuid
+from datetime import datetime, timedelta
+
 import pytest
+import sqlalchemy  # type: ignore[import-not-found]
+from sqlalchemy.dialects import mssql  # type: ignore[import-not-found]
 
 from zodchy.codex import operator
 
-from zodchy_alchemy import SlicesAssembler
+from zodchy_alchemy import Keyset, OrdersAssembler, QueryAssembler, SlicesAssembler
+from zodchy_alchemy import contracts
+
+from . import schema
 
 
 @pytest.fixture
@@ -28,3 +38,109 @@ def test_pagination(assembler):
         )
     ).strip()
     assert "LIMIT :param_1 OFFSET :param_2" in q
+
+
+def _row(**values):
+    return types.SimpleNamespace(_mapping={getattr(schema.firmware.c, name): value for name, value in values.items()})
+
+
+def test_keyset_first_page_orders_by_key(assembler):
+    q = str(assembler(Keyset(schema.firmware.c.id), operator.Limit(10))).strip()
+    assert "ORDER BY firmware.id ASC" in q
+    assert "WHERE" not in q
+
+
+def test_keyset_uses_row_values_for_uniform_ordering(base_query):
+    query = OrdersAssembler(base_query)(contracts.Clause(schema.firmware.c.version, operator.DESC()))
+    first_page = SlicesAssembler(query)(Keyset(schema.firmware.c.id))
+    cursor = SlicesAssembler.next_cursor(first_page, [_row(version="2.0", id=uuid.UUID(int=7))])
+    compiled = SlicesAssembler(query)(Keyset(schema.firmware.c.id, cursor)).compile()
+
+    assert "WHERE (firmware.version, firmware.id) < (:param_1, :param_2)" in str(compiled)
+    assert "ORDER BY firmware.version DESC, firmware.id DESC" in str(compiled)
+    assert list(compiled.params.values()) == ["2.0", uuid.UUID(int=7)]
+
+
+def test_keyset_expands_mixed_ordering(base_query):
+    query = OrdersAssembler(base_query)(
+        contracts.Clause(schema.firmware.c.version, operator.DESC()),
+        contracts.Clause(schema.firmware.c.id, operator.ASC()),
+    )
+    first_page = SlicesAssembler(query)(Keyset(schema.firmware.c.uri))
+    cursor = SlicesAssembler.next_cursor(first_page, [_row(version="2.0", id=uuid.UUID(int=7), uri="fw")])
+    q = SlicesAssembler(query)(Keyset(schema.firmware.c.uri, cursor))
+
+    assert (
+        "WHERE firmware.version < :param_1 OR firmware.version = :param_1 AND firmware.id > :param_2 "
+        "OR firmware.version = :param_1 AND firmware.id = :param_2 AND firmware.uri > :param_3"
+    ) in str(q)
+
+
+def test_keyset_expands_on_dialects_without_row_values(base_query):
+    query = OrdersAssembler(base_query)(contracts.Clause(schema.firmware.c.version, operator.ASC()))
+    first_page = SlicesAssembler(query)(Keyset(schema.firmware.c.id))
+    cursor = SlicesAssembler.next_cursor(first_page, [_row(version="2.0", id=uuid.UUID(int=7))])
+    q = str(SlicesAssembler(query)(Keyset(schema.firmware.c.id, cursor)).compile(dialect=mssql.dialect()))
+    assert "firmware.version > :param_1 OR firmware.version = :param_1 AND firmware.id > :param_2" in q
+
+
+def test_next_cursor_stops_on_short_page(assembler):
+    query = assembler(Keyset(schema.firmware.c.id), operator.Limit(10))
+    assert SlicesAssembler.next_cursor(query, []) is None
+    assert SlicesAssembler.next_cursor(query, [_row(id=uuid.UUID(int=1))]) is None
+
+
+def test_keyset_rejects_invalid_cursor(assembler):
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        assembler(Keyset(schema.firmware.c.id, "not-a-cursor"))
+
+
+def test_keyset_rejects_nullable_ordering_columns(assembler):
+    query = OrdersAssembler(assembler(operator.Limit(10)))(
+        contracts.Clause(schema.firmware.c.updated_at, operator.DESC())
+    )
+    with pytest.raises(ValueError, match="Expected non-nullable ordering columns"):
+        SlicesAssembler(query)(Keyset(schema.firmware.c.id))
+    with pytest.raises(ValueError, match="Expected non-nullable ordering columns"):
+        assembler(Keyset(schema.firmware.c.deleted_at))
+
+
+def test_next_cursor_rejects_null_and_unsupported_values(assembler):
+    kind = enum.Enum("Kind", "A B")
+    query = assembler(Keyset(schema.firmware.c.version), operator.Limit(1))
+    with pytest.raises(ValueError, match="Expected a non-NULL value in ordering column"):
+        SlicesAssembler.next_cursor(query, [_row(version=None)])
+    with pytest.raises(ValueError, match="Expected a cursor value of a supported type, got Kind"):
+        SlicesAssembler.next_cursor(query, [_row(version=kind.A)])
+
+
+def test_keyset_pages_through_table():
+    metadata = sqlalchemy.MetaData()
+    events = sqlalchemy.Table(
+        "events",
+        metadata,
+        sqlalchemy.Column("id", sqlalchemy.Integer, primary_key=True),
+        sqlalchemy.Column("created_at", sqlalchemy.DateTime, nullable=False),
+    )
+    engine = sqlalchemy.create_engine("sqlite://")
+    metadata.create_all(engine)
+    started = datetime(2024, 1, 1)
+    seen = []
+    with engine.connect() as connection:
+        connection.execute(
+            sqlalchemy.insert(events),
+            [{"id": i, "created_at": started + timedelta(hours=i // 3)} for i in range(25)],
+        )
+        cursor = None
+        while True:
+            query = QueryAssembler(sqlalchemy.select(events.c.id, events.c.created_at))(
+                contracts.Clause(events.c.created_at, operator.DESC()),
+                Keyset(events.c.id, cursor),
+                operator.Limit(10),
+            )
+            rows = connection.execute(query).all()
+            seen.extend(row.id for row in rows)
+            if (cursor := SlicesAssembler.next_cursor(query, rows)) is None:
+                break
+
+    assert seen == sorted(range(25), key=lambda i: (-(i // 3), -i))